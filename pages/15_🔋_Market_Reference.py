@@ -324,7 +324,9 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 # -----------------------------------------------------------------------------
 # TAB 1: Manufacturer Products
 # -----------------------------------------------------------------------------
-with tab1:
+@st.fragment
+def render_products_tab():
+    """Manufacturer products tab. Filter changes rerun only this fragment."""
     st.subheader("Utility-Scale BESS Products (2025)")
 
     # Filters
@@ -405,6 +407,10 @@ with tab1:
         fig3.update_layout(height=400)
         st.plotly_chart(fig3, use_container_width=True)
 
+
+with tab1:
+    render_products_tab()
+
 # -----------------------------------------------------------------------------
 # TAB 2: Container Sizes
 # -----------------------------------------------------------------------------
@@ -582,7 +588,9 @@ with tab4:
 # -----------------------------------------------------------------------------
 # TAB 5: Pricing
 # -----------------------------------------------------------------------------
-with tab5:
+@st.fragment
+def render_pricing_tab():
+    """Pricing tab. Calculator inputs rerun only this fragment."""
     st.subheader("Market Pricing (2025)")
 
     df_pricing = pd.DataFrame(PRICING_DATA)
@@ -642,6 +650,10 @@ with tab5:
     with col3:
         st.metric("Total CAPEX", f"${total_cost/1e6:,.1f}M")
 
+
+with tab5:
+    render_pricing_tab()
+
 # =============================================================================
 # FOOTER
 # =============================================================================
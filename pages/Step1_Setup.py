@@ -8,10 +8,12 @@ Define the energy system being evaluated:
 - DG enabled/disabled
 """
 
+import io
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 # Add parent directory to path for imports
 import sys
@@ -24,8 +26,8 @@ from src.wizard_state import (
     validate_step_1, get_step_status
 )
 from src.load_builder import (
-    build_load_profile, analyze_load_profile, validate_load_csv,
-    validate_solar_csv, analyze_solar_profile,
+    build_load_profile, analyze_load_profile, read_profile_csv,
+    validate_load_csv, validate_solar_csv, analyze_solar_profile,
     get_load_sparkline_data, LOAD_PRESETS,
     calculate_seasonal_stats, MONTH_NAMES_FULL
 )
@@ -47,6 +49,25 @@ init_wizard_state()
 set_current_step(1)
 
 
+# =============================================================================
+# WIDGET OPTION LABELS
+# =============================================================================
+
+# Built once per process and looked up by the selectboxes' format_func
+LOAD_MODE_LABELS = {
+    'constant': 'Constant (24/7)',
+    'day_only': 'Day Only',
+    'night_only': 'Night Only',
+    'seasonal': 'Seasonal Pattern',
+    'custom': 'Custom Windows',
+}
+MONTH_LABELS = dict(zip(range(1, 13), MONTH_NAMES_FULL))
+HOUR_LABELS = {hour: f"{hour:02d}:00" for hour in range(24)}
+# End time: 1-23 plus 0 (midnight) at the end
+SEASON_END_OPTIONS = list(range(1, 24)) + [0]
+SEASON_END_LABELS = {**HOUR_LABELS, 0: "Midnight (00:00)"}
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -74,11 +95,40 @@ def render_step_indicator():
                 st.markdown(f"🔒 Step {num}: {label}")
 
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def parse_profile_csv(csv_bytes: bytes, kind: str):
+    """Parse and validate an uploaded 'load' or 'solar' CSV, memoized on its bytes.
+
+    The uploader keeps the file across reruns, so only a new upload is re-scanned.
+    Returns the validator's ``(is_valid, message, data)`` tuple.
+    """
+    df = read_profile_csv(io.BytesIO(csv_bytes))
+    validate = validate_load_csv if kind == 'load' else validate_solar_csv
+    return validate(df)
+
+
+def typical_day_profile(profile: np.ndarray) -> np.ndarray:
+    """Average each hour of day across the profile (one reshape, no per-hour masks)."""
+    profile = np.asarray(profile, dtype=float)
+    n = (len(profile) // 24) * 24
+    return profile[:n].reshape(-1, 24).mean(axis=0)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_load_preview(mode: str, params: dict):
+    """Build the load profile and its stats, memoized on the mode and params.
+
+    The params dict (including custom windows and CSV arrays) is hashed by
+    st.cache_data directly, so unchanged inputs skip the 8760-hour rebuild.
+    """
+    load_profile = build_load_profile(mode, params)
+    return load_profile, analyze_load_profile(load_profile)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
 def create_load_preview_chart(load: np.ndarray) -> go.Figure:
     """Create a daily load pattern preview chart."""
-    # Calculate hourly averages for typical day
-    hours = np.arange(len(load)) % 24
-    hourly_avg = [np.mean(load[hours == h]) for h in range(24)]
+    hourly_avg = typical_day_profile(load)
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -100,67 +150,90 @@ def create_load_preview_chart(load: np.ndarray) -> go.Figure:
     return fig
 
 
-def create_solar_preview_chart(solar: np.ndarray) -> go.Figure:
-    """Create a daily solar generation pattern preview chart."""
-    # Calculate hourly averages for typical day
-    hours = np.arange(len(solar)) % 24
-    hourly_avg = [np.mean(solar[hours == h]) for h in range(24)]
+@st.cache_data(max_entries=8, show_spinner=False)
+def create_solar_profile_chart(solar: np.ndarray) -> go.Figure:
+    """Create the solar preview: typical-day pattern above monthly generation.
 
-    fig = go.Figure()
+    Both panels share one figure so the page sends a single chart payload.
+    """
+    hourly_avg = typical_day_profile(solar)
+
+    # Monthly totals (MWh = MW * 1 hour) over an hourly index starting 2024-01-01
+    date_range = pd.date_range(start=pd.Timestamp('2024-01-01'), periods=len(solar), freq='h')
+    monthly_generation = pd.Series(np.asarray(solar), index=date_range).groupby(date_range.month).sum()
+
+    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        row_heights=[0.45, 0.55],
+        vertical_spacing=0.18,
+        subplot_titles=("", "Monthly Solar Generation"),
+    )
     fig.add_trace(go.Bar(
         x=list(range(24)),
         y=hourly_avg,
         marker_color='#f4a460',  # Sandy brown for solar
         name='Solar'
-    ))
+    ), row=1, col=1)
+    fig.add_trace(go.Bar(
+        x=month_names[:len(monthly_generation)],
+        y=monthly_generation.values,
+        marker_color='#f4a460',
+        name='Generation',
+        text=[f'{v:,.0f}' for v in monthly_generation.values],
+        textposition='outside',
+        textfont=dict(size=10)
+    ), row=2, col=1)
 
     fig.update_layout(
-        height=200,
+        height=450,
         margin=dict(l=40, r=20, t=20, b=40),
-        xaxis_title="Hour of Day",
-        yaxis_title="MW",
         showlegend=False,
-        xaxis=dict(tickmode='array', tickvals=list(range(0, 24, 3))),
     )
+    fig.update_annotations(font=dict(size=14))
+    fig.update_xaxes(title_text="Hour of Day", tickmode='array', tickvals=list(range(0, 24, 3)), row=1, col=1)
+    fig.update_yaxes(title_text="MW", row=1, col=1)
+    fig.update_xaxes(title_text="Month", row=2, col=1)
+    fig.update_yaxes(title_text="MWh", row=2, col=1)
 
     return fig
 
 
-def create_monthly_generation_chart(solar: np.ndarray) -> go.Figure:
-    """Create a monthly solar generation bar chart."""
-    import pandas as pd
-
-    # Create datetime index for a full year (non-leap)
-    start_date = pd.Timestamp('2024-01-01')
-    date_range = pd.date_range(start=start_date, periods=len(solar), freq='h')
-
-    # Create DataFrame with solar data
-    df = pd.DataFrame({'solar_mw': solar}, index=date_range)
-
-    # Calculate monthly totals (MWh = MW * 1 hour)
-    monthly_generation = df.groupby(df.index.month)['solar_mw'].sum()
-
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+@st.cache_data(max_entries=8, show_spinner=False)
+def create_storable_solar_chart(storable_solar: np.ndarray) -> go.Figure:
+    """Create the year-long storable solar curve (solar minus load when positive)."""
+    max_storable = float(storable_solar.max())
 
+    # The x axis defaults to the hour index and the float32 copy serializes with
+    # shorter reprs, which shrinks the 8760-point payload; the page metrics keep
+    # full float64 precision.
     fig = go.Figure()
-    fig.add_trace(go.Bar(
-        x=month_names,
-        y=monthly_generation.values,
-        marker_color='#f4a460',  # Sandy brown for solar
-        name='Generation',
-        text=[f'{v:,.0f}' for v in monthly_generation.values],
-        textposition='outside',
-        textfont=dict(size=10)
+
+    fig.add_trace(go.Scatter(
+        y=storable_solar.astype(np.float32),
+        mode='lines',
+        name='Storable Solar',
+        fill='tozeroy',
+        fillcolor='rgba(255, 165, 0, 0.3)',
+        line=dict(color='orange', width=1)
     ))
 
+    fig.add_hline(
+        y=max_storable,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Max: {max_storable:.2f} MW"
+    )
+
     fig.update_layout(
-        height=250,
-        margin=dict(l=40, r=20, t=30, b=40),
-        xaxis_title="Month",
-        yaxis_title="MWh",
-        showlegend=False,
-        title=dict(text="Monthly Solar Generation", font=dict(size=14)),
+        title="Storable Solar Throughout the Year (Solar - Load when positive)",
+        xaxis_title="Hour of Year",
+        yaxis_title="Storable Solar (MW)",
+        height=350,
+        margin=dict(l=40, r=20, t=40, b=40),
+        hovermode='x unified'
     )
 
     return fig
@@ -201,7 +274,7 @@ if load_source == 'builder':
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        load_options = ['constant', 'day_only', 'night_only', 'seasonal', 'custom']
+        load_options = list(LOAD_MODE_LABELS)
         current_mode = setup.get('load_mode', 'constant')
         current_index = load_options.index(current_mode) if current_mode in load_options else 0
 
@@ -209,16 +282,9 @@ if load_source == 'builder':
             "Load Pattern",
             options=load_options,
             index=current_index,
-            format_func=lambda x: {
-                'constant': 'Constant (24/7)',
-                'day_only': 'Day Only',
-                'night_only': 'Night Only',
-                'seasonal': 'Seasonal Pattern',
-                'custom': 'Custom Windows'
-            }.get(x, x),
+            format_func=LOAD_MODE_LABELS.__getitem__,
             key='load_mode_select'
         )
-        update_wizard_state('setup', 'load_mode', load_mode)
 
         load_mw = st.number_input(
             "Load (MW)",
@@ -228,7 +294,7 @@ if load_source == 'builder':
             step=5.0,
             key='load_mw_input'
         )
-        update_wizard_state('setup', 'load_mw', load_mw)
+        update_wizard_section('setup', {'load_mode': load_mode, 'load_mw': load_mw})
 
     with col2:
         if load_mode == 'day_only':
@@ -244,8 +310,7 @@ if load_source == 'builder':
                 value=setup['load_day_end'],
                 key='day_end_slider'
             )
-            update_wizard_state('setup', 'load_day_start', day_start)
-            update_wizard_state('setup', 'load_day_end', day_end)
+            update_wizard_section('setup', {'load_day_start': day_start, 'load_day_end': day_end})
 
         elif load_mode == 'night_only':
             night_start = st.slider(
@@ -260,51 +325,47 @@ if load_source == 'builder':
                 value=setup['load_night_end'],
                 key='night_end_slider'
             )
-            update_wizard_state('setup', 'load_night_start', night_start)
-            update_wizard_state('setup', 'load_night_end', night_end)
+            update_wizard_section('setup', {'load_night_start': night_start, 'load_night_end': night_end})
 
         elif load_mode == 'seasonal':
             st.markdown("**Active Months:**")
             season_start = st.selectbox(
                 "From",
-                options=list(range(1, 13)),
-                format_func=lambda x: MONTH_NAMES_FULL[x-1],
+                options=list(MONTH_LABELS),
+                format_func=MONTH_LABELS.__getitem__,
                 index=setup.get('load_season_start', 4) - 1,
                 key='season_start_select'
             )
             season_end = st.selectbox(
                 "To",
-                options=list(range(1, 13)),
-                format_func=lambda x: MONTH_NAMES_FULL[x-1],
+                options=list(MONTH_LABELS),
+                format_func=MONTH_LABELS.__getitem__,
                 index=setup.get('load_season_end', 10) - 1,
                 key='season_end_select'
             )
-            update_wizard_state('setup', 'load_season_start', season_start)
-            update_wizard_state('setup', 'load_season_end', season_end)
+            update_wizard_section('setup', {'load_season_start': season_start, 'load_season_end': season_end})
 
             st.markdown("**Daily Window:**")
-            # Time options with readable labels
-            hour_options = list(range(24))
             day_start_hour = st.selectbox(
                 "Start Time",
-                options=hour_options,
-                format_func=lambda x: f"{x:02d}:00",
+                options=list(HOUR_LABELS),
+                format_func=HOUR_LABELS.__getitem__,
                 index=setup.get('load_season_day_start', 8),
                 key='season_day_start_select'
             )
-            # End time: 1-23 plus 0 (midnight) at the end
-            end_options = list(range(1, 24)) + [0]
             current_end = setup.get('load_season_day_end', 0)
-            end_index = end_options.index(current_end) if current_end in end_options else len(end_options) - 1
+            if current_end in SEASON_END_LABELS:
+                end_index = SEASON_END_OPTIONS.index(current_end)
+            else:
+                end_index = len(SEASON_END_OPTIONS) - 1
             day_end_hour = st.selectbox(
                 "End Time",
-                options=end_options,
-                format_func=lambda x: "Midnight (00:00)" if x == 0 else f"{x:02d}:00",
+                options=SEASON_END_OPTIONS,
+                format_func=SEASON_END_LABELS.__getitem__,
                 index=end_index,
                 key='season_day_end_select'
             )
-            update_wizard_state('setup', 'load_season_day_start', day_start_hour)
-            update_wizard_state('setup', 'load_season_day_end', day_end_hour)
+            update_wizard_section('setup', {'load_season_day_start': day_start_hour, 'load_season_day_end': day_end_hour})
 
             # Preview stats
             stats = calculate_seasonal_stats(season_start, season_end, day_start_hour, day_end_hour)
@@ -347,8 +408,7 @@ if load_source == 'builder':
     else:
         params = {'mw': load_mw}
 
-    load_profile = build_load_profile(load_mode, params)
-    stats = analyze_load_profile(load_profile)
+    load_profile, stats = build_load_preview(load_mode, params)
 
     # Preview
     st.markdown("**Preview:**")
@@ -377,15 +437,13 @@ else:
 
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
-            is_valid, message, data = validate_load_csv(df)
+            is_valid, message, data = parse_profile_csv(uploaded_file.getvalue(), 'load')
 
             if is_valid:
                 st.success(message)
                 update_wizard_state('setup', 'load_csv_data', data)
 
-                load_profile = build_load_profile('csv', {'data': data})
-                stats = analyze_load_profile(load_profile)
+                load_profile, stats = build_load_preview('csv', {'data': data})
 
                 col1, col2, col3 = st.columns(3)
                 col1.metric("Total Energy", f"{stats['total_energy_mwh']:,.0f} MWh/yr")
@@ -489,12 +547,11 @@ else:
 
     if uploaded_solar is not None:
         try:
-            df = pd.read_csv(uploaded_solar)
-            is_valid, message, data = validate_solar_csv(df)
+            is_valid, message, data = parse_profile_csv(uploaded_solar.getvalue(), 'solar')
 
             if is_valid:
                 st.success(message)
-                update_wizard_state('setup', 'solar_csv_data', data.tolist())  # Store as list for JSON serialization
+                update_wizard_state('setup', 'solar_csv_data', data)  # Kept as a float ndarray, like load_csv_data
                 active_solar_profile = data
             else:
                 st.error(message)
@@ -504,7 +561,7 @@ else:
         # Check if we have previously uploaded data
         stored_solar = setup.get('solar_csv_data')
         if stored_solar is not None:
-            active_solar_profile = np.array(stored_solar)
+            active_solar_profile = np.asarray(stored_solar, dtype=float)
             st.info(f"Using previously uploaded solar profile: {len(active_solar_profile)} hours")
         else:
             st.info("Please upload a CSV file with hourly solar generation data")
@@ -519,10 +576,8 @@ if active_solar_profile is not None and len(active_solar_profile) > 0:
     col3.metric("Avg Generation", f"{stats['mean_mw']:.1f} MW")
     col4.metric("Generation Hours", f"{stats['generation_hours']:,}/8760")
 
-    st.plotly_chart(create_solar_preview_chart(active_solar_profile), use_container_width=True)
-
-    # Monthly generation profile
-    st.plotly_chart(create_monthly_generation_chart(active_solar_profile), use_container_width=True)
+    # Typical-day pattern and monthly generation profile
+    st.plotly_chart(create_solar_profile_chart(active_solar_profile), use_container_width=True)
 
     # Store the active solar profile for use in simulation
     if solar_source == 'inputs':
@@ -547,7 +602,7 @@ if load_source == 'builder':
     current_load_profile = load_profile
     have_load_profile = True
 elif load_source == 'csv' and setup.get('load_csv_data') is not None:
-    current_load_profile = build_load_profile('csv', {'data': setup['load_csv_data']})
+    current_load_profile, _ = build_load_preview('csv', {'data': setup['load_csv_data']})
     have_load_profile = True
 else:
     current_load_profile = None
@@ -585,38 +640,7 @@ if have_load_profile and have_solar_profile:
     else:
         col4.metric("Max Available", "N/A")
 
-    # Create storable solar curve
-    hours = np.arange(len(storable_solar))
-
-    fig_storable = go.Figure()
-
-    fig_storable.add_trace(go.Scatter(
-        x=hours,
-        y=storable_solar,
-        mode='lines',
-        name='Storable Solar',
-        fill='tozeroy',
-        fillcolor='rgba(255, 165, 0, 0.3)',
-        line=dict(color='orange', width=1)
-    ))
-
-    fig_storable.add_hline(
-        y=max_storable,
-        line_dash="dash",
-        line_color="red",
-        annotation_text=f"Max: {max_storable:.2f} MW"
-    )
-
-    fig_storable.update_layout(
-        title="Storable Solar Throughout the Year (Solar - Load when positive)",
-        xaxis_title="Hour of Year",
-        yaxis_title="Storable Solar (MW)",
-        height=350,
-        margin=dict(l=40, r=20, t=40, b=40),
-        hovermode='x unified'
-    )
-
-    st.plotly_chart(fig_storable, use_container_width=True)
+    st.plotly_chart(create_storable_solar_chart(storable_solar), use_container_width=True)
 
 
 st.divider()
@@ -643,7 +667,6 @@ container_types = st.multiselect(
     format_func=lambda x: container_options[x],
     key='bess_container_types_multiselect'
 )
-update_wizard_state('setup', 'bess_container_types', container_types)
 
 # Show specs for selected containers
 if container_types:
@@ -658,74 +681,95 @@ else:
 
 st.markdown("---")
 
-col1, col2, col3 = st.columns(3)
+# The container choice drives the caption and warning above, so it stays live;
+# the battery sliders are batched in a form so dragging one does not rerun the
+# page (and its load/solar previews) until the settings are applied.
+with st.form('bess_form', border=False):
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    bess_efficiency = st.slider(
-        "Round-trip Efficiency (%)",
-        min_value=70,
-        max_value=95,
-        value=int(setup['bess_efficiency']),
-        step=1,
-        key='bess_efficiency_slider'
-    )
-    update_wizard_state('setup', 'bess_efficiency', float(bess_efficiency))
-
-with col2:
-    bess_min_soc = st.slider(
-        "Min State of Charge (%)",
-        min_value=0,
-        max_value=50,
-        value=int(setup['bess_min_soc']),
-        step=5,
-        key='bess_min_soc_slider'
-    )
-    update_wizard_state('setup', 'bess_min_soc', float(bess_min_soc))
-
-    bess_max_soc = st.slider(
-        "Max State of Charge (%)",
-        min_value=50,
-        max_value=100,
-        value=int(setup['bess_max_soc']),
-        step=5,
-        key='bess_max_soc_slider'
-    )
-    update_wizard_state('setup', 'bess_max_soc', float(bess_max_soc))
+    with col1:
+        bess_efficiency = st.slider(
+            "Round-trip Efficiency (%)",
+            min_value=70,
+            max_value=95,
+            value=int(setup['bess_efficiency']),
+            step=1,
+            key='bess_efficiency_slider'
+        )
 
-with col3:
-    bess_initial_soc = st.slider(
-        "Initial State of Charge (%)",
-        min_value=int(bess_min_soc),
-        max_value=int(bess_max_soc),
-        value=min(max(int(setup['bess_initial_soc']), int(bess_min_soc)), int(bess_max_soc)),
-        step=5,
-        key='bess_initial_soc_slider'
-    )
-    update_wizard_state('setup', 'bess_initial_soc', float(bess_initial_soc))
+    with col2:
+        bess_min_soc = st.slider(
+            "Min State of Charge (%)",
+            min_value=0,
+            max_value=50,
+            value=int(setup['bess_min_soc']),
+            step=5,
+            key='bess_min_soc_slider'
+        )
 
-# Advanced BESS settings
-with st.expander("⚙️ Advanced BESS Settings"):
-    col1, col2 = st.columns(2)
+        bess_max_soc = st.slider(
+            "Max State of Charge (%)",
+            min_value=50,
+            max_value=100,
+            value=int(setup['bess_max_soc']),
+            step=5,
+            key='bess_max_soc_slider'
+        )
 
-    with col1:
-        bess_cycle_limit = st.number_input(
-            "Daily Cycle Limit",
-            min_value=0.5,
-            max_value=3.0,
-            value=float(setup['bess_daily_cycle_limit']),
-            step=0.1,
-            key='bess_cycle_limit_input'
+    with col3:
+        # Fixed bounds: Min/Max SOC are in the same form, so bounds taken from
+        # them would be stale until Apply (and would reset this slider's value)
+        bess_initial_soc = st.slider(
+            "Initial State of Charge (%)",
+            min_value=0,
+            max_value=100,
+            value=int(setup['bess_initial_soc']),
+            step=5,
+            key='bess_initial_soc_slider'
         )
-        update_wizard_state('setup', 'bess_daily_cycle_limit', bess_cycle_limit)
 
-    with col2:
-        bess_enforce_limit = st.checkbox(
-            "Enforce Cycle Limit",
-            value=setup['bess_enforce_cycle_limit'],
-            help="If enabled, BESS will stop discharging when daily cycle limit is reached",
-            key='bess_enforce_limit_check'
+    # Advanced BESS settings
+    with st.expander("⚙️ Advanced BESS Settings"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            bess_cycle_limit = st.number_input(
+                "Daily Cycle Limit",
+                min_value=0.5,
+                max_value=3.0,
+                value=float(setup['bess_daily_cycle_limit']),
+                step=0.1,
+                key='bess_cycle_limit_input'
+            )
+
+        with col2:
+            bess_enforce_limit = st.checkbox(
+                "Enforce Cycle Limit",
+                value=setup['bess_enforce_cycle_limit'],
+                help="If enabled, BESS will stop discharging when daily cycle limit is reached",
+                key='bess_enforce_limit_check'
+            )
+
+    # Keep the initial SOC inside the applied Min/Max SOC range
+    clamped_initial_soc = min(max(bess_initial_soc, bess_min_soc), bess_max_soc)
+    if clamped_initial_soc != bess_initial_soc:
+        st.warning(
+            f"Initial SOC {bess_initial_soc}% is outside the {bess_min_soc}-{bess_max_soc}% "
+            f"SOC range; using {clamped_initial_soc}%."
         )
-        update_wizard_state('setup', 'bess_enforce_cycle_limit', bess_enforce_limit)
+        bess_initial_soc = clamped_initial_soc
+
+    update_wizard_section('setup', {
+        'bess_container_types': container_types,
+        'bess_efficiency': float(bess_efficiency),
+        'bess_min_soc': float(bess_min_soc),
+        'bess_max_soc': float(bess_max_soc),
+        'bess_initial_soc': float(bess_initial_soc),
+        'bess_daily_cycle_limit': bess_cycle_limit,
+        'bess_enforce_cycle_limit': bess_enforce_limit,
+    })
+
+    st.form_submit_button("Apply Battery Settings")
 
 
 st.divider()
@@ -735,128 +779,151 @@ st.divider()
 # GENERATOR (DG) SECTION
 # =============================================================================
 
-st.subheader("⛽ Generator (DG)")
+def dg_summary(setup) -> tuple:
+    """The DG values shown in the sidebar summary."""
+    if not setup['dg_enabled']:
+        return (False,)
+    dg_mode = setup.get('dg_operating_mode', 'binary')
+    return (True, dg_mode, setup['dg_min_load_pct'] if dg_mode == 'variable' else None)
 
-dg_enabled = st.checkbox(
-    "Include diesel/gas generator in system",
-    value=setup['dg_enabled'],
-    key='dg_enabled_check'
-)
-update_wizard_state('setup', 'dg_enabled', dg_enabled)
 
-if dg_enabled:
-    col1, col2 = st.columns(2)
+@st.fragment
+def render_dg_section():
+    """Generator settings. Widget changes rerun only this fragment."""
+    setup = get_wizard_state()['setup']
+    summary_before = dg_summary(setup)
 
-    with col1:
-        dg_operating_mode = st.radio(
-            "DG Operating Mode",
-            options=['binary', 'variable'],
-            format_func=lambda x: "Binary (100% capacity or OFF)" if x == 'binary' else "Variable (above minimum load)",
-            index=0 if setup.get('dg_operating_mode', 'binary') == 'binary' else 1,
-            help="Binary: DG runs at full capacity only. Variable: DG can run at any load above minimum.",
-            key='dg_operating_mode_radio'
-        )
-        update_wizard_state('setup', 'dg_operating_mode', dg_operating_mode)
-
-        # Show minimum load slider only for variable mode
-        if dg_operating_mode == 'variable':
-            dg_min_load = st.slider(
-                "Minimum Stable Load (%)",
-                min_value=10,
-                max_value=50,
-                value=int(setup['dg_min_load_pct']),
-                step=5,
-                help="DG cannot run below this percentage of capacity",
-                key='dg_min_load_slider'
-            )
-            update_wizard_state('setup', 'dg_min_load_pct', float(dg_min_load))
-        else:
-            # Binary mode: internally set to 100%
-            update_wizard_state('setup', 'dg_min_load_pct', 100.0)
-            st.caption("ℹ️ In binary mode, DG will only run at 100% capacity when needed")
+    st.subheader("⛽ Generator (DG)")
 
-    with col2:
-        st.info("DG capacity will be configured in Step 3 (Sizing)")
-
-    # Advanced DG Fuel Model
-    with st.expander("⛽ Advanced DG Fuel Model"):
-        fuel_curve_enabled = st.checkbox(
-            "Use advanced fuel curve model",
-            value=setup.get('dg_fuel_curve_enabled', False),
-            help="Uses Willans line model: Fuel = F0 x P_rated + F1 x P_actual",
-            key='fuel_curve_enabled_check'
-        )
-        update_wizard_state('setup', 'dg_fuel_curve_enabled', fuel_curve_enabled)
-
-        if fuel_curve_enabled:
-            fcol1, fcol2 = st.columns(2)
-            with fcol1:
-                f0 = st.number_input(
-                    "F0 (No-load coeff, L/hr/kW)",
-                    min_value=0.01,
-                    max_value=0.10,
-                    value=float(setup.get('dg_fuel_f0', 0.03)),
-                    step=0.005,
-                    format="%.3f",
-                    help="Fuel consumption per kW of rated capacity at zero load",
-                    key='dg_f0_input'
+    dg_enabled = st.checkbox(
+        "Include diesel/gas generator in system",
+        value=setup['dg_enabled'],
+        key='dg_enabled_check'
+    )
+    dg_updates = {'dg_enabled': dg_enabled}
+
+    if dg_enabled:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            dg_operating_mode = st.radio(
+                "DG Operating Mode",
+                options=['binary', 'variable'],
+                format_func=lambda x: "Binary (100% capacity or OFF)" if x == 'binary' else "Variable (above minimum load)",
+                index=0 if setup.get('dg_operating_mode', 'binary') == 'binary' else 1,
+                help="Binary: DG runs at full capacity only. Variable: DG can run at any load above minimum.",
+                key='dg_operating_mode_radio'
+            )
+            dg_updates['dg_operating_mode'] = dg_operating_mode
+
+            # Show minimum load slider only for variable mode
+            if dg_operating_mode == 'variable':
+                dg_min_load = st.slider(
+                    "Minimum Stable Load (%)",
+                    min_value=10,
+                    max_value=50,
+                    value=int(setup['dg_min_load_pct']),
+                    step=5,
+                    help="DG cannot run below this percentage of capacity",
+                    key='dg_min_load_slider'
                 )
-                update_wizard_state('setup', 'dg_fuel_f0', f0)
-
-            with fcol2:
-                f1 = st.number_input(
-                    "F1 (Load coeff, L/kWh)",
+                dg_updates['dg_min_load_pct'] = float(dg_min_load)
+            else:
+                # Binary mode: internally set to 100%
+                dg_updates['dg_min_load_pct'] = 100.0
+                st.caption("ℹ️ In binary mode, DG will only run at 100% capacity when needed")
+
+        with col2:
+            st.info("DG capacity will be configured in Step 3 (Sizing)")
+
+        # Advanced DG Fuel Model
+        with st.expander("⛽ Advanced DG Fuel Model"):
+            fuel_curve_enabled = st.checkbox(
+                "Use advanced fuel curve model",
+                value=setup.get('dg_fuel_curve_enabled', False),
+                help="Uses Willans line model: Fuel = F0 x P_rated + F1 x P_actual",
+                key='fuel_curve_enabled_check'
+            )
+            dg_updates['dg_fuel_curve_enabled'] = fuel_curve_enabled
+
+            if fuel_curve_enabled:
+                fcol1, fcol2 = st.columns(2)
+                with fcol1:
+                    f0 = st.number_input(
+                        "F0 (No-load coeff, L/hr/kW)",
+                        min_value=0.01,
+                        max_value=0.10,
+                        value=float(setup.get('dg_fuel_f0', 0.03)),
+                        step=0.005,
+                        format="%.3f",
+                        help="Fuel consumption per kW of rated capacity at zero load",
+                        key='dg_f0_input'
+                    )
+                    dg_updates['dg_fuel_f0'] = f0
+
+                with fcol2:
+                    f1 = st.number_input(
+                        "F1 (Load coeff, L/kWh)",
+                        min_value=0.15,
+                        max_value=0.35,
+                        value=float(setup.get('dg_fuel_f1', 0.22)),
+                        step=0.01,
+                        format="%.2f",
+                        help="Fuel consumption per kWh of actual output",
+                        key='dg_f1_input'
+                    )
+                    dg_updates['dg_fuel_f1'] = f1
+
+                # Show efficiency table
+                st.markdown("**Efficiency at Different Load Levels (25 MW DG):**")
+                eff_data = []
+                for load_pct in [25, 50, 75, 100]:
+                    p_actual_kw = 25000 * (load_pct / 100)
+                    fuel_rate = f0 * 25000 + f1 * p_actual_kw
+                    specific = fuel_rate / p_actual_kw if p_actual_kw > 0 else 0
+                    eff_data.append({
+                        'Load': f"{load_pct}%",
+                        'Output': f"{p_actual_kw/1000:.1f} MW",
+                        'Fuel Rate': f"{fuel_rate:.0f} L/hr",
+                        'Specific': f"{specific:.3f} L/kWh"
+                    })
+                st.dataframe(pd.DataFrame(eff_data), hide_index=True, use_container_width=True)
+
+                st.caption("Lower load = higher specific fuel consumption (less efficient)")
+            else:
+                flat_rate = st.number_input(
+                    "Flat fuel rate (L/kWh)",
                     min_value=0.15,
-                    max_value=0.35,
-                    value=float(setup.get('dg_fuel_f1', 0.22)),
+                    max_value=0.40,
+                    value=float(setup.get('dg_fuel_flat_rate', 0.25)),
                     step=0.01,
                     format="%.2f",
-                    help="Fuel consumption per kWh of actual output",
-                    key='dg_f1_input'
+                    key='dg_flat_rate_input'
                 )
-                update_wizard_state('setup', 'dg_fuel_f1', f1)
-
-            # Show efficiency table
-            st.markdown("**Efficiency at Different Load Levels (25 MW DG):**")
-            eff_data = []
-            for load_pct in [25, 50, 75, 100]:
-                p_actual_kw = 25000 * (load_pct / 100)
-                fuel_rate = f0 * 25000 + f1 * p_actual_kw
-                specific = fuel_rate / p_actual_kw if p_actual_kw > 0 else 0
-                eff_data.append({
-                    'Load': f"{load_pct}%",
-                    'Output': f"{p_actual_kw/1000:.1f} MW",
-                    'Fuel Rate': f"{fuel_rate:.0f} L/hr",
-                    'Specific': f"{specific:.3f} L/kWh"
-                })
-            st.dataframe(pd.DataFrame(eff_data), hide_index=True, use_container_width=True)
-
-            st.caption("Lower load = higher specific fuel consumption (less efficient)")
-        else:
-            flat_rate = st.number_input(
-                "Flat fuel rate (L/kWh)",
-                min_value=0.15,
-                max_value=0.40,
-                value=float(setup.get('dg_fuel_flat_rate', 0.25)),
-                step=0.01,
+                dg_updates['dg_fuel_flat_rate'] = flat_rate
+
+            fuel_price = st.number_input(
+                "Fuel price ($/L)",
+                min_value=0.50,
+                max_value=5.00,
+                value=float(setup.get('dg_fuel_price', 1.50)),
+                step=0.10,
                 format="%.2f",
-                key='dg_flat_rate_input'
+                key='dg_fuel_price_input'
             )
-            update_wizard_state('setup', 'dg_fuel_flat_rate', flat_rate)
-
-        fuel_price = st.number_input(
-            "Fuel price ($/L)",
-            min_value=0.50,
-            max_value=5.00,
-            value=float(setup.get('dg_fuel_price', 1.50)),
-            step=0.10,
-            format="%.2f",
-            key='dg_fuel_price_input'
-        )
-        update_wizard_state('setup', 'dg_fuel_price', fuel_price)
+            dg_updates['dg_fuel_price'] = fuel_price
 
-else:
-    st.info("No generator in this configuration. System will be Solar + BESS only.")
+    else:
+        st.info("No generator in this configuration. System will be Solar + BESS only.")
+
+    update_wizard_section('setup', dg_updates)
+
+    # The sidebar lives outside the fragment; refresh the page only when it changes
+    if dg_summary(setup) != summary_before:
+        st.rerun()
+
+
+render_dg_section()
 
 
 st.divider()
@@ -885,16 +952,20 @@ with col3:
 # Summary box
 with st.sidebar:
     st.markdown("### 📋 Configuration Summary")
-    st.markdown(f"**Load:** {setup['load_mw']} MW ({setup['load_mode']})")
     solar_src = setup.get('solar_source', 'default')
-    st.markdown(f"**Solar:** {'Default' if solar_src == 'default' else 'Uploaded'} profile")
-    st.markdown(f"**BESS Efficiency:** {setup['bess_efficiency']}%")
-    st.markdown(f"**SOC Range:** {setup['bess_min_soc']}-{setup['bess_max_soc']}%")
     if setup['dg_enabled']:
         dg_mode = setup.get('dg_operating_mode', 'binary')
         if dg_mode == 'binary':
-            st.markdown("**DG:** Binary (100% or OFF)")
+            dg_line = "**DG:** Binary (100% or OFF)"
         else:
-            st.markdown(f"**DG:** Variable (≥{setup['dg_min_load_pct']:.0f}%)")
+            dg_line = f"**DG:** Variable (≥{setup['dg_min_load_pct']:.0f}%)"
     else:
-        st.markdown("**DG:** Disabled")
+        dg_line = "**DG:** Disabled"
+    # One markdown element (paragraph per line) instead of one delta per line
+    st.markdown("\n\n".join([
+        f"**Load:** {setup['load_mw']} MW ({setup['load_mode']})",
+        f"**Solar:** {'Default' if solar_src == 'default' else 'Uploaded'} profile",
+        f"**BESS Efficiency:** {setup['bess_efficiency']}%",
+        f"**SOC Range:** {setup['bess_min_soc']}-{setup['bess_max_soc']}%",
+        dg_line,
+    ]))
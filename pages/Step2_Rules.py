@@ -6,6 +6,7 @@ The system infers the appropriate template from user answers.
 """
 
 import streamlit as st
+from functools import lru_cache
 
 # Add parent directory to path for imports
 import sys
@@ -13,13 +14,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.wizard_state import (
-    init_wizard_state, get_wizard_state, update_wizard_state,
+    DEFAULT_WIZARD_STATE, init_wizard_state, get_wizard_state, update_wizard_state,
     update_wizard_section, set_current_step, mark_step_completed,
     validate_step_2, get_step_status, can_navigate_to_step
 )
 from src.template_inference import (
     infer_template, get_template_info, get_template_display_card,
-    get_valid_triggers_for_timing, TEMPLATES
+    TEMPLATES, VALID_TRIGGERS_BY_TIMING
 )
 
 
@@ -45,6 +46,54 @@ if not can_navigate_to_step(2):
     st.stop()
 
 
+# =============================================================================
+# WIDGET OPTIONS
+# =============================================================================
+
+# Option tuples and their position maps are built once per process
+DG_TIMING_LABELS = {
+    'anytime': "Anytime",
+    'day_only': "Day only",
+    'night_only': "Night only",
+    'custom_blackout': "Custom blackout",
+}
+DG_TIMING_KEYS = tuple(DG_TIMING_LABELS)
+DG_TIMING_INDEX = {key: i for i, key in enumerate(DG_TIMING_KEYS)}
+
+# Trigger options per timing, from the template inference table
+DG_TRIGGER_LABELS = {
+    key: label for triggers in VALID_TRIGGERS_BY_TIMING.values() for key, label in triggers
+}
+DG_TRIGGER_KEYS_BY_TIMING = {
+    timing: tuple(key for key, _ in triggers) for timing, triggers in VALID_TRIGGERS_BY_TIMING.items()
+}
+DG_TRIGGER_INDEX_BY_TIMING = {
+    timing: {key: i for i, key in enumerate(keys)} for timing, keys in DG_TRIGGER_KEYS_BY_TIMING.items()
+}
+
+# Hour window sliders per timing: ((start rule, label), (end rule, label))
+TIME_WINDOW_FIELDS = {
+    'day_only': (('day_start', "Start"), ('day_end', "End")),
+    'night_only': (('night_start', "Start"), ('night_end', "End")),
+    'custom_blackout': (('blackout_start', "Blackout from"), ('blackout_end', "Until")),
+}
+LOAD_PRIORITY_LABELS = {'bess_first': "BESS First", 'dg_first': "DG First"}
+LOAD_PRIORITY_KEYS = tuple(LOAD_PRIORITY_LABELS)
+
+# Yes/No questions: labels keyed by the boolean answer
+YES_NO_OPTIONS = (False, True)
+DG_CHARGES_BESS_LABELS = {False: "No — solar only", True: "Yes — excess charges BESS"}
+DG_TAKEOVER_LABELS = {False: "No — DG fills gap", True: "Yes — DG serves full load"}
+CYCLE_CHARGING_LABELS = {False: "No — DG follows load", True: "Yes — DG at min load %"}
+
+# Rules read by the sidebar summary or validate_step_2
+PAGE_RULE_KEYS = (
+    'inferred_template', 'dg_timing', 'dg_trigger', 'dg_charges_bess', 'dg_load_priority',
+    'dg_takeover_mode', 'cycle_charging_enabled', 'soc_on_threshold', 'soc_off_threshold',
+    'blackout_start', 'blackout_end',
+)
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -72,17 +121,13 @@ def render_step_indicator():
                 st.markdown(f"🔒 Step {num}: {label}")
 
 
-def render_template_card(template_id: int, dg_charges_bess: bool = False, dg_load_priority: str = 'bess_first'):
-    """Render an informational card showing the inferred template."""
+@lru_cache(maxsize=32)
+def template_card_text(template_id: int, dg_charges_bess: bool, dg_load_priority: str) -> tuple:
+    """Build the (title, merit order, description) text of a template card."""
     info = get_template_info(template_id)
 
-    # Color coding based on DG usage
-    if not info['dg_enabled']:
-        border_color = "#2ecc71"  # Green
-        icon = "☀️"
-    else:
-        border_color = "#3498db"  # Blue
-        icon = "⚡"
+    # Icon based on DG usage
+    icon = "⚡" if info['dg_enabled'] else "☀️"
 
     # Build merit order based on load priority
     if not info['dg_enabled']:
@@ -104,18 +149,16 @@ def render_template_card(template_id: int, dg_charges_bess: bool = False, dg_loa
         else:
             description += " (Battery charges from solar only)"
 
-    st.markdown(f"""
-    <div style="
-        border: 2px solid {border_color};
-        border-radius: 10px;
-        padding: 15px;
-        background-color: rgba(255,255,255,0.05);
-    ">
-        <h4 style="margin: 0;">{icon} {info['name']}</h4>
-        <p style="color: #888; margin: 5px 0;">{merit_order}</p>
-        <p style="margin: 5px 0;">{description}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    return f"{icon} {info['name']}", merit_order, description
+
+
+def render_template_card(template_id: int, dg_charges_bess: bool = False, dg_load_priority: str = 'bess_first'):
+    """Render an informational card showing the inferred template."""
+    title, merit_order, description = template_card_text(template_id, dg_charges_bess, dg_load_priority)
+    with st.container(border=True):
+        st.markdown(f"#### {title}")
+        st.caption(merit_order)
+        st.markdown(description)
 
 
 # =============================================================================
@@ -133,6 +176,9 @@ st.divider()
 state = get_wizard_state()
 setup = state['setup']
 rules = state['rules']
+# Backfill keys added after older sessions were created, so reads below can index directly
+for key, value in DEFAULT_WIZARD_STATE['rules'].items():
+    rules.setdefault(key, value)
 
 dg_enabled = setup['dg_enabled']
 
@@ -157,22 +203,34 @@ if not dg_enabled:
     """)
 
     # Set template to 0
-    update_wizard_state('rules', 'inferred_template', 0)
+    if rules['inferred_template'] != 0:
+        update_wizard_state('rules', 'inferred_template', 0)
 
 
 # =============================================================================
 # WITH DG - QUESTION-BASED TEMPLATE INFERENCE
 # =============================================================================
 
-else:
+def page_rules_summary(rules) -> tuple:
+    """The rule values shown in the sidebar or checked by validate_step_2."""
+    return tuple(rules[key] for key in PAGE_RULE_KEYS)
+
+
+@st.fragment
+def render_dg_rules():
+    """DG rule questions and the inferred template. Widget changes rerun only this fragment."""
+    state = get_wizard_state()
+    setup = state['setup']
+    rules = state['rules']
+    summary_before = page_rules_summary(rules)
+
     st.markdown("### How should your system operate?")
     st.markdown("Configure your dispatch strategy using the options below.")
 
-    # Get valid triggers based on current timing (needed for Q2)
-    dg_timing_current = rules.get('dg_timing', 'anytime')
-    valid_triggers = get_valid_triggers_for_timing(dg_timing_current)
-    trigger_options = {t[0]: t[1] for t in valid_triggers} if valid_triggers else {'reactive': 'Reactive'}
-
+    # Widgets are live (no form): timing, trigger and cycle charging decide
+    # which sliders and trigger options appear, and the fragment keeps each
+    # change to a rerun of this section only
+    new_rules = {}
     # ===========================================
     # ROW 1: Questions 1-3
     # ===========================================
@@ -184,48 +242,24 @@ else:
             st.markdown("##### 1. When can DG run?")
             st.caption("📊 **Impact:** Restricts DG to specific hours. Affects green hours vs DG hours balance.")
 
-            dg_timing_options = {
-                'anytime': "Anytime",
-                'day_only': "Day only",
-                'night_only': "Night only",
-                'custom_blackout': "Custom blackout",
-            }
-
             dg_timing = st.radio(
                 "DG timing:",
-                options=list(dg_timing_options.keys()),
-                format_func=lambda x: dg_timing_options[x],
-                index=list(dg_timing_options.keys()).index(rules['dg_timing']),
+                options=DG_TIMING_KEYS,
+                format_func=DG_TIMING_LABELS.__getitem__,
+                index=DG_TIMING_INDEX[rules['dg_timing']],
                 key='dg_timing_radio',
                 label_visibility="collapsed"
             )
-            update_wizard_state('rules', 'dg_timing', dg_timing)
+            new_rules['dg_timing'] = dg_timing
 
-            # Time window settings
-            if dg_timing == 'day_only':
-                tc1, tc2 = st.columns(2)
-                with tc1:
-                    day_start = st.slider("Start", 0, 23, rules['day_start'], key='day_start_slider')
-                    update_wizard_state('rules', 'day_start', day_start)
-                with tc2:
-                    day_end = st.slider("End", 0, 23, rules['day_end'], key='day_end_slider')
-                    update_wizard_state('rules', 'day_end', day_end)
-            elif dg_timing == 'night_only':
+            # Time window settings: one column pair, whichever window applies
+            if dg_timing in TIME_WINDOW_FIELDS:
+                (start_key, start_label), (end_key, end_label) = TIME_WINDOW_FIELDS[dg_timing]
                 tc1, tc2 = st.columns(2)
                 with tc1:
-                    night_start = st.slider("Start", 0, 23, rules['night_start'], key='night_start_slider')
-                    update_wizard_state('rules', 'night_start', night_start)
+                    new_rules[start_key] = st.slider(start_label, 0, 23, rules[start_key], key=f'{start_key}_slider')
                 with tc2:
-                    night_end = st.slider("End", 0, 23, rules['night_end'], key='night_end_slider')
-                    update_wizard_state('rules', 'night_end', night_end)
-            elif dg_timing == 'custom_blackout':
-                tc1, tc2 = st.columns(2)
-                with tc1:
-                    blackout_start = st.slider("Blackout from", 0, 23, rules['blackout_start'], key='blackout_start_slider')
-                    update_wizard_state('rules', 'blackout_start', blackout_start)
-                with tc2:
-                    blackout_end = st.slider("Until", 0, 23, rules['blackout_end'], key='blackout_end_slider')
-                    update_wizard_state('rules', 'blackout_end', blackout_end)
+                    new_rules[end_key] = st.slider(end_label, 0, 23, rules[end_key], key=f'{end_key}_slider')
 
     # --- Q2: DG Trigger ---
     with row1_col2:
@@ -233,24 +267,24 @@ else:
             st.markdown("##### 2. What triggers DG?")
             st.caption("📊 **Impact:** Controls DG start frequency. Affects DG runtime hours and start count.")
 
-            # Update valid triggers based on new timing
-            valid_triggers = get_valid_triggers_for_timing(dg_timing)
-            trigger_options = {t[0]: t[1] for t in valid_triggers}
+            # Valid triggers depend on the timing chosen in Q1
+            trigger_keys = DG_TRIGGER_KEYS_BY_TIMING[dg_timing]
+            trigger_index = DG_TRIGGER_INDEX_BY_TIMING[dg_timing]
 
             current_trigger = rules['dg_trigger']
-            if current_trigger not in trigger_options:
-                current_trigger = list(trigger_options.keys())[0]
-                update_wizard_state('rules', 'dg_trigger', current_trigger)
+            if current_trigger not in trigger_index:
+                current_trigger = trigger_keys[0]
+                new_rules['dg_trigger'] = current_trigger
 
             dg_trigger = st.radio(
                 "DG trigger:",
-                options=list(trigger_options.keys()),
-                format_func=lambda x: trigger_options[x],
-                index=list(trigger_options.keys()).index(current_trigger),
+                options=trigger_keys,
+                format_func=DG_TRIGGER_LABELS.__getitem__,
+                index=trigger_index[current_trigger],
                 key='dg_trigger_radio',
                 label_visibility="collapsed"
             )
-            update_wizard_state('rules', 'dg_trigger', dg_trigger)
+            new_rules['dg_trigger'] = dg_trigger
 
             # SoC thresholds
             if dg_trigger == 'soc_based':
@@ -260,13 +294,13 @@ else:
                         "ON below %", int(setup['bess_min_soc']), int(setup['bess_max_soc']) - 10,
                         int(rules['soc_on_threshold']), step=5, key='soc_on_slider'
                     )
-                    update_wizard_state('rules', 'soc_on_threshold', float(soc_on))
+                    new_rules['soc_on_threshold'] = float(soc_on)
                 with tc2:
                     soc_off = st.slider(
                         "OFF above %", soc_on + 10, int(setup['bess_max_soc']),
                         max(int(rules['soc_off_threshold']), soc_on + 10), step=5, key='soc_off_slider'
                     )
-                    update_wizard_state('rules', 'soc_off_threshold', float(soc_off))
+                    new_rules['soc_off_threshold'] = float(soc_off)
 
     # --- Q3: DG Charges BESS ---
     with row1_col3:
@@ -276,13 +310,13 @@ else:
 
             dg_charges_bess = st.radio(
                 "DG charging:",
-                options=[False, True],
-                format_func=lambda x: "Yes — excess charges BESS" if x else "No — solar only",
+                options=YES_NO_OPTIONS,
+                format_func=DG_CHARGES_BESS_LABELS.__getitem__,
                 index=1 if rules['dg_charges_bess'] else 0,
                 key='dg_charges_bess_radio',
                 label_visibility="collapsed"
             )
-            update_wizard_state('rules', 'dg_charges_bess', dg_charges_bess)
+            new_rules['dg_charges_bess'] = dg_charges_bess
 
     # ===========================================
     # ROW 2: Questions 4-6
@@ -297,13 +331,13 @@ else:
 
             dg_load_priority = st.radio(
                 "Priority:",
-                options=['bess_first', 'dg_first'],
-                format_func=lambda x: "BESS First" if x == 'bess_first' else "DG First",
-                index=0 if rules.get('dg_load_priority', 'bess_first') == 'bess_first' else 1,
+                options=LOAD_PRIORITY_KEYS,
+                format_func=LOAD_PRIORITY_LABELS.__getitem__,
+                index=0 if rules['dg_load_priority'] == 'bess_first' else 1,
                 key='dg_load_priority_radio',
                 label_visibility="collapsed"
             )
-            update_wizard_state('rules', 'dg_load_priority', dg_load_priority)
+            new_rules['dg_load_priority'] = dg_load_priority
 
             if dg_load_priority == 'bess_first':
                 st.caption("Solar → BESS → DG")
@@ -318,13 +352,13 @@ else:
 
             dg_takeover_mode = st.radio(
                 "Takeover:",
-                options=[False, True],
-                format_func=lambda x: "Yes — DG serves full load" if x else "No — DG fills gap",
-                index=1 if rules.get('dg_takeover_mode', True) else 0,
+                options=YES_NO_OPTIONS,
+                format_func=DG_TAKEOVER_LABELS.__getitem__,
+                index=1 if rules['dg_takeover_mode'] else 0,
                 key='dg_takeover_mode_radio',
                 label_visibility="collapsed"
             )
-            update_wizard_state('rules', 'dg_takeover_mode', dg_takeover_mode)
+            new_rules['dg_takeover_mode'] = dg_takeover_mode
 
             if dg_takeover_mode:
                 st.caption("DG → Load, Solar → BESS")
@@ -340,37 +374,43 @@ else:
                 st.caption("⚠️ Not available in Binary DG mode (DG always runs at 100%).")
                 st.info("Switch to **Variable** DG mode in Step 1 to enable cycle charging.")
                 cycle_charging = False
-                update_wizard_state('rules', 'cycle_charging_enabled', False)
+                new_rules['cycle_charging_enabled'] = False
             else:
                 st.caption("📊 **Impact:** If Yes, DG runs at higher load for fuel efficiency. Excess charges BESS.")
 
                 cycle_charging = st.radio(
                     "Cycle charging:",
-                    options=[False, True],
-                    format_func=lambda x: "Yes — DG at min load %" if x else "No — DG follows load",
-                    index=1 if rules.get('cycle_charging_enabled', False) else 0,
+                    options=YES_NO_OPTIONS,
+                    format_func=CYCLE_CHARGING_LABELS.__getitem__,
+                    index=1 if rules['cycle_charging_enabled'] else 0,
                     key='cycle_charging_radio',
                     label_visibility="collapsed"
                 )
-                update_wizard_state('rules', 'cycle_charging_enabled', cycle_charging)
+                new_rules['cycle_charging_enabled'] = cycle_charging
 
                 if cycle_charging:
                     tc1, tc2 = st.columns(2)
                     with tc1:
                         min_load = st.slider(
                             "Min load %", 50, 90,
-                            int(rules.get('cycle_charging_min_load_pct', 70)), step=5,
+                            int(rules['cycle_charging_min_load_pct']), step=5,
                             key='cycle_min_load_slider'
                         )
-                        update_wizard_state('rules', 'cycle_charging_min_load_pct', float(min_load))
+                        new_rules['cycle_charging_min_load_pct'] = float(min_load)
                     with tc2:
                         off_soc = st.slider(
                             "Stop SOC %",
-                            int(rules.get('soc_on_threshold', 30)) + 20, int(setup['bess_max_soc']),
-                            int(rules.get('cycle_charging_off_soc', 80)), step=5,
+                            int(rules['soc_on_threshold']) + 20, int(setup['bess_max_soc']),
+                            int(rules['cycle_charging_off_soc']), step=5,
                             key='cycle_off_soc_slider'
                         )
-                        update_wizard_state('rules', 'cycle_charging_off_soc', float(off_soc))
+                        new_rules['cycle_charging_off_soc'] = float(off_soc)
+
+
+    # Write back only the answers that changed on this run
+    changed_rules = {key: value for key, value in new_rules.items() if rules.get(key) != value}
+    if changed_rules:
+        update_wizard_section('rules', changed_rules)
 
     st.markdown("---")
 
@@ -380,11 +420,20 @@ else:
         dg_timing=dg_timing,
         dg_trigger=rules['dg_trigger']
     )
-    update_wizard_state('rules', 'inferred_template', template_id)
+    if rules['inferred_template'] != template_id:
+        update_wizard_state('rules', 'inferred_template', template_id)
 
     st.markdown("### 📊 Dispatch Strategy Selected")
     render_template_card(template_id, dg_charges_bess, dg_load_priority)
 
+    # The sidebar and validation live outside the fragment; refresh the page only when they change
+    if page_rules_summary(rules) != summary_before:
+        st.rerun()
+
+
+if dg_enabled:
+    render_dg_rules()
+
 
 st.divider()
 
@@ -416,25 +465,26 @@ with col3:
 
 # Sidebar summary
 with st.sidebar:
-    st.markdown("### 📋 Configuration Summary")
-
-    # From Step 1
-    st.markdown("**Step 1 - Setup:**")
-    st.markdown(f"- Load: {setup['load_mw']} MW")
-    st.markdown(f"- Solar: {setup['solar_capacity_mw']} MWp")
-    st.markdown(f"- DG: {'Enabled' if dg_enabled else 'Disabled'}")
-
-    st.markdown("---")
-
-    # Step 2
-    st.markdown("**Step 2 - Rules:**")
     template_info = get_template_info(rules['inferred_template'])
-    st.markdown(f"- Strategy: {template_info['name']}")
+    step2_lines = [f"- Strategy: {template_info['name']}"]
     if dg_enabled:
-        st.markdown(f"- DG Timing: {rules['dg_timing'].replace('_', ' ').title()}")
-        st.markdown(f"- DG Trigger: {rules['dg_trigger'].replace('_', ' ').title()}")
-        st.markdown(f"- DG Charges BESS: {'Yes' if rules['dg_charges_bess'] else 'No'}")
-        load_priority_display = "BESS First" if rules.get('dg_load_priority', 'bess_first') == 'bess_first' else "DG First"
-        st.markdown(f"- Load Priority: {load_priority_display}")
-        st.markdown(f"- Takeover Mode: {'Yes' if rules.get('dg_takeover_mode', False) else 'No'}")
-        st.markdown(f"- Cycle Charging: {'Yes' if rules.get('cycle_charging_enabled', False) else 'No'}")
+        step2_lines += [
+            f"- DG Timing: {rules['dg_timing'].replace('_', ' ').title()}",
+            f"- DG Trigger: {rules['dg_trigger'].replace('_', ' ').title()}",
+            f"- DG Charges BESS: {'Yes' if rules['dg_charges_bess'] else 'No'}",
+            f"- Load Priority: {LOAD_PRIORITY_LABELS[rules['dg_load_priority']]}",
+            f"- Takeover Mode: {'Yes' if rules['dg_takeover_mode'] else 'No'}",
+            f"- Cycle Charging: {'Yes' if rules['cycle_charging_enabled'] else 'No'}",
+        ]
+    # One markdown element instead of one delta per line
+    st.markdown("\n\n".join([
+        "### 📋 Configuration Summary",
+        "\n".join([
+            "**Step 1 - Setup:**",
+            f"- Load: {setup['load_mw']} MW",
+            f"- Solar: {setup['solar_capacity_mw']} MWp",
+            f"- DG: {'Enabled' if dg_enabled else 'Disabled'}",
+        ]),
+        "---",
+        "\n".join(["**Step 2 - Rules:**"] + step2_lines),
+    ]))
@@ -5,6 +5,10 @@ Run 8760-hour simulations across BESS configurations to find optimal sizing.
 Configurations use discrete 5 MWh container increments.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 import streamlit as st
 import numpy as np
 import pandas as pd
@@ -18,11 +22,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.wizard_state import (
     init_wizard_state, get_wizard_state, update_wizard_state,
-    set_current_step, mark_step_completed, get_step_status, can_navigate_to_step
+    set_current_step, mark_step_completed, get_all_step_statuses, can_navigate_to_step
 )
 from src.load_builder import build_load_profile
 from src.data_loader import load_solar_profile, load_solar_profile_by_name
-from src.dispatch_engine import SimulationParams, run_simulation, calculate_metrics
+from src.dispatch_engine import SimulationParams, iter_batch_metrics
 
 
 # =============================================================================
@@ -66,12 +70,13 @@ if not can_navigate_to_step(3):
 
 def render_step_indicator():
     """Render the step progress indicator."""
+    statuses = get_all_step_statuses()
     steps = [
-        ("1", "Setup", get_step_status(1)),
-        ("2", "Rules", get_step_status(2)),
+        ("1", "Setup", statuses[1]),
+        ("2", "Rules", statuses[2]),
         ("3", "Sizing", 'current'),
-        ("4", "Results", get_step_status(4)),
-        ("5", "Multi-Year", get_step_status(5)),
+        ("4", "Results", statuses[4]),
+        ("5", "Multi-Year", statuses[5]),
     ]
 
     cols = st.columns(5)
@@ -136,6 +141,11 @@ def get_solar_profile(setup):
     return None
 
 
+def sweep_values(minimum, maximum, step) -> np.ndarray:
+    """Sweep points from minimum in whole steps, never exceeding maximum."""
+    return np.arange(int(minimum), int(maximum) + 1, int(step))
+
+
 def run_sizing_simulation(capacity_range, container_types, dg_range, setup, rules, progress_callback=None):
     """
     Run batch simulation for all BESS/DG configurations.
@@ -163,78 +173,88 @@ def run_sizing_simulation(capacity_range, container_types, dg_range, setup, rule
 
     # Generate configurations
     configs = []
-    cap_min, cap_max, cap_step = capacity_range
-    cap_values = np.arange(cap_min, cap_max + cap_step, cap_step)
+    cap_values = sweep_values(*capacity_range)
 
     # DG values
     if dg_range and setup['dg_enabled']:
-        dg_min, dg_max, dg_step = dg_range
-        dg_values = np.arange(dg_min, dg_max + dg_step, dg_step)
+        dg_values = sweep_values(*dg_range)
     else:
         dg_values = [0]
 
+    # Container sizes are looked up once, not per capacity step
+    container_sizes = [
+        (container_type, CONTAINER_SPECS[container_type]['duration_hr'], CONTAINER_SPECS[container_type]['energy_mwh'])
+        for container_type in container_types
+    ]
+
     # Build all configs
     for cap in cap_values:
-        for container_type in container_types:
-            spec = CONTAINER_SPECS[container_type]
-            power = cap / spec['duration_hr']  # MW = MWh / hours
+        for container_type, duration_hr, energy_mwh in container_sizes:
+            power = cap / duration_hr  # MW = MWh / hours
+            containers = int(cap / energy_mwh)
 
             for dg in dg_values:
                 configs.append({
                     'capacity_mwh': float(cap),
                     'container_type': container_type,
-                    'duration_hr': spec['duration_hr'],
+                    'duration_hr': duration_hr,
                     'power_mw': float(power),
                     'dg_capacity_mw': float(dg),
-                    'containers': int(cap / spec['energy_mwh']),
+                    'containers': containers,
                 })
 
-    # Run simulations
-    results = []
-    total = len(configs)
-
-    for i, config in enumerate(configs):
-        if progress_callback:
-            progress_callback(i + 1, total, f"Config {i+1}/{total}: {config['capacity_mwh']:.0f} MWh, {config['duration_hr']}hr")
-
-        # Build simulation params
-        params = SimulationParams(
-            load_profile=load_profile.tolist(),
-            solar_profile=solar_profile,
+    # Settings shared by every configuration; the load list is built once so
+    # the batch runner ships a single copy of it to its workers
+    shared_params = dict(
+        load_profile=load_profile.tolist(),
+        solar_profile=solar_profile,
+        bess_efficiency=setup['bess_efficiency'],
+        bess_min_soc=setup['bess_min_soc'],
+        bess_max_soc=setup['bess_max_soc'],
+        bess_initial_soc=setup['bess_initial_soc'],
+        bess_daily_cycle_limit=setup['bess_daily_cycle_limit'],
+        bess_enforce_cycle_limit=setup['bess_enforce_cycle_limit'],
+        dg_charges_bess=rules.get('dg_charges_bess', False),
+        dg_load_priority=rules.get('dg_load_priority', 'bess_first'),
+        dg_takeover_mode=rules.get('dg_takeover_mode', False),
+        night_start_hour=rules.get('night_start', 18),
+        night_end_hour=rules.get('night_end', 6),
+        day_start_hour=rules.get('day_start', 6),
+        day_end_hour=rules.get('day_end', 18),
+        blackout_start_hour=rules.get('blackout_start', 22),
+        blackout_end_hour=rules.get('blackout_end', 6),
+        dg_soc_on_threshold=rules.get('soc_on_threshold', 30),
+        dg_soc_off_threshold=rules.get('soc_off_threshold', 80),
+        dg_fuel_curve_enabled=setup.get('dg_fuel_curve_enabled', False),
+        dg_fuel_f0=setup.get('dg_fuel_f0', 0.03),
+        dg_fuel_f1=setup.get('dg_fuel_f1', 0.22),
+        dg_fuel_flat_rate=setup.get('dg_fuel_flat_rate', 0.25),
+        cycle_charging_enabled=rules.get('cycle_charging_enabled', False),
+        cycle_charging_min_load_pct=rules.get('cycle_charging_min_load_pct', 70.0),
+        cycle_charging_off_soc=rules.get('cycle_charging_off_soc', 80.0),
+    )
+    params_list = [
+        SimulationParams(
             bess_capacity=config['capacity_mwh'],
             bess_charge_power=config['power_mw'],
             bess_discharge_power=config['power_mw'],
-            bess_efficiency=setup['bess_efficiency'],
-            bess_min_soc=setup['bess_min_soc'],
-            bess_max_soc=setup['bess_max_soc'],
-            bess_initial_soc=setup['bess_initial_soc'],
-            bess_daily_cycle_limit=setup['bess_daily_cycle_limit'],
-            bess_enforce_cycle_limit=setup['bess_enforce_cycle_limit'],
             dg_enabled=setup['dg_enabled'] and config['dg_capacity_mw'] > 0,
             dg_capacity=config['dg_capacity_mw'],
-            dg_charges_bess=rules.get('dg_charges_bess', False),
-            dg_load_priority=rules.get('dg_load_priority', 'bess_first'),
-            dg_takeover_mode=rules.get('dg_takeover_mode', False),
-            night_start_hour=rules.get('night_start', 18),
-            night_end_hour=rules.get('night_end', 6),
-            day_start_hour=rules.get('day_start', 6),
-            day_end_hour=rules.get('day_end', 18),
-            blackout_start_hour=rules.get('blackout_start', 22),
-            blackout_end_hour=rules.get('blackout_end', 6),
-            dg_soc_on_threshold=rules.get('soc_on_threshold', 30),
-            dg_soc_off_threshold=rules.get('soc_off_threshold', 80),
-            dg_fuel_curve_enabled=setup.get('dg_fuel_curve_enabled', False),
-            dg_fuel_f0=setup.get('dg_fuel_f0', 0.03),
-            dg_fuel_f1=setup.get('dg_fuel_f1', 0.22),
-            dg_fuel_flat_rate=setup.get('dg_fuel_flat_rate', 0.25),
-            cycle_charging_enabled=rules.get('cycle_charging_enabled', False),
-            cycle_charging_min_load_pct=rules.get('cycle_charging_min_load_pct', 70.0),
-            cycle_charging_off_soc=rules.get('cycle_charging_off_soc', 80.0),
+            **shared_params,
         )
+        for config in configs
+    ]
 
-        # Run simulation
-        hourly_results = run_simulation(params, template_id, num_hours=8760)
-        metrics = calculate_metrics(hourly_results, params)
+    # Run simulations (in parallel where CPUs allow); metrics arrive in config order
+    results = []
+    total = len(configs)
+    batch_metrics = iter_batch_metrics(params_list, template_id, num_hours=8760)
+    # Each progress update is a round-trip to the browser; report about 100 steps at most
+    progress_every = max(1, total // 100)
+
+    for i, (config, metrics) in enumerate(zip(configs, batch_metrics)):
+        if progress_callback and ((i + 1) % progress_every == 0 or i + 1 == total):
+            progress_callback(i + 1, total, f"Config {i+1}/{total}: {config['capacity_mwh']:.0f} MWh, {config['duration_hr']}hr")
 
         # Store result
         results.append({
@@ -243,20 +263,112 @@ def run_sizing_simulation(capacity_range, container_types, dg_range, setup, rule
             'Power (MW)': config['power_mw'],
             'Containers': config['containers'],
             'DG (MW)': config['dg_capacity_mw'],
-            'Delivery %': round(metrics.pct_full_delivery, 1),
-            'Green %': round(metrics.pct_green_delivery, 1) if metrics.hours_full_delivery > 0 else 0,
-            'Wastage %': round(metrics.pct_solar_curtailed, 1),
+            'Delivery %': metrics.pct_full_delivery,
+            'Green %': metrics.pct_green_delivery,
+            'Wastage %': metrics.pct_solar_curtailed,
             'Delivery Hrs': metrics.hours_full_delivery,
             'Load Hrs': metrics.hours_with_load,
             'Green Hrs': metrics.hours_green_delivery,
             'DG Hrs': metrics.dg_runtime_hours,
             'DG Starts': metrics.dg_starts,
-            'BESS Cycles': round(metrics.bess_equivalent_cycles, 0),
-            'Unserved (MWh)': round(metrics.total_unserved, 1),
-            'Fuel (L)': round(metrics.total_fuel_consumed, 0),
+            'BESS Cycles': metrics.bess_equivalent_cycles,
+            'Unserved (MWh)': metrics.total_unserved,
+            'Fuel (L)': metrics.total_fuel_consumed,
         })
 
-    return pd.DataFrame(results)
+    # Round once per column rather than per configuration
+    results_df = pd.DataFrame(results)
+    results_df['Green %'] = np.where(results_df['Delivery Hrs'] > 0, results_df['Green %'], 0.0)
+    return results_df.round({
+        'Delivery %': 1, 'Green %': 1, 'Wastage %': 1,
+        'BESS Cycles': 0, 'Unserved (MWh)': 1, 'Fuel (L)': 0,
+    })
+
+
+# Setup and rules fields that run_sizing_simulation reads; sweeps are cached on these
+SWEEP_SETUP_FIELDS = (
+    'load_mode', 'load_mw', 'load_day_start', 'load_day_end', 'load_windows',
+    'load_season_start', 'load_season_end', 'load_season_day_start', 'load_season_day_end',
+    'solar_source', 'solar_selected_file', 'dg_enabled',
+    'bess_efficiency', 'bess_min_soc', 'bess_max_soc', 'bess_initial_soc',
+    'bess_daily_cycle_limit', 'bess_enforce_cycle_limit',
+    'dg_fuel_curve_enabled', 'dg_fuel_f0', 'dg_fuel_f1', 'dg_fuel_flat_rate',
+)
+SWEEP_RULES_FIELDS = (
+    'inferred_template', 'dg_charges_bess', 'dg_load_priority', 'dg_takeover_mode',
+    'night_start', 'night_end', 'day_start', 'day_end', 'blackout_start', 'blackout_end',
+    'soc_on_threshold', 'soc_off_threshold',
+    'cycle_charging_enabled', 'cycle_charging_min_load_pct', 'cycle_charging_off_soc',
+)
+SWEEP_CACHE_ENTRIES = 16
+
+
+def profile_digest(data):
+    """Short digest of an uploaded profile, or None if nothing is uploaded."""
+    if data is None:
+        return None
+    return hashlib.sha1(np.ascontiguousarray(data, dtype=float).tobytes()).hexdigest()
+
+
+def sizing_sweep_key(capacity_range, container_types, dg_range, setup, rules):
+    """
+    Hashable key for a sizing sweep built from the scalar inputs it reads.
+
+    Uploaded 8760-hour profiles enter the key as a digest, and only when the
+    load mode or solar source actually uses them.
+    """
+    windows = tuple(tuple(sorted(w.items())) for w in setup.get('load_windows', []))
+    setup_key = tuple(
+        windows if field == 'load_windows' else setup.get(field)
+        for field in SWEEP_SETUP_FIELDS
+    )
+    rules_key = tuple(rules.get(field) for field in SWEEP_RULES_FIELDS)
+    uploads = (
+        profile_digest(setup.get('load_csv_data')) if setup['load_mode'] == 'csv' else None,
+        profile_digest(setup.get('solar_csv_data')) if setup.get('solar_source') == 'upload' else None,
+    )
+    return (tuple(capacity_range), tuple(container_types), dg_range and tuple(dg_range),
+            setup_key, rules_key, uploads)
+
+
+@st.cache_resource(show_spinner=False)
+def sizing_sweep_store():
+    """Sizing tables already evaluated, shared across sessions (oldest first)."""
+    return threading.Lock(), OrderedDict()
+
+
+def run_sizing_sweep(capacity_range, container_types, dg_range, setup, rules, progress_callback=None):
+    """
+    Run run_sizing_simulation, reusing the table of an identical earlier sweep.
+
+    Re-running a sweep that was already evaluated (e.g. after going back to
+    an earlier step and returning) returns the stored table without
+    reporting progress. Only the computation is cached: the caller owns the
+    progress elements, so a hit replays nothing. st.cache_data is not used
+    because it would record every progress update made through the callback.
+
+    Returns:
+        DataFrame with simulation results (a copy the caller may modify)
+    """
+    key = sizing_sweep_key(capacity_range, container_types, dg_range, setup, rules)
+    lock, store = sizing_sweep_store()
+
+    with lock:
+        cached = store.get(key)
+        if cached is not None:
+            store.move_to_end(key)
+            return cached.copy()
+
+    results_df = run_sizing_simulation(
+        capacity_range, container_types, dg_range, setup, rules,
+        progress_callback=progress_callback
+    )
+
+    with lock:
+        store[key] = results_df
+        while len(store) > SWEEP_CACHE_ENTRIES:
+            store.popitem(last=False)
+    return results_df.copy()
 
 
 # =============================================================================
@@ -381,9 +493,10 @@ with col2:
 st.divider()
 
 # Calculate number of configurations
-num_cap_values = ((cap_max - cap_min) // CAPACITY_STEP_MWH) + 1
+# (same grid as run_sizing_simulation builds)
+num_cap_values = len(sweep_values(cap_min, cap_max, CAPACITY_STEP_MWH))
 num_duration_values = len(container_types)
-num_dg_values = ((dg_max - dg_min) // dg_step) + 1 if dg_enabled else 1
+num_dg_values = len(sweep_values(dg_min, dg_max, dg_step)) if dg_enabled else 1
 total_configs = int(num_cap_values * num_duration_values * num_dg_values)
 
 col1, col2, col3, col4 = st.columns(4)
@@ -418,11 +531,11 @@ if st.button("🚀 Run Sizing Simulation", type="primary", use_container_width=T
         status_text.text(message)
 
     try:
-        # Run simulation
+        # Run simulation (a repeated sweep returns its stored table)
         capacity_range = (cap_min, cap_max, CAPACITY_STEP_MWH)
         dg_range = (dg_min, dg_max, dg_step) if dg_enabled else None
 
-        results_df = run_sizing_simulation(
+        results_df = run_sizing_sweep(
             capacity_range=capacity_range,
             container_types=container_types,
             dg_range=dg_range,
@@ -470,8 +583,8 @@ if 'sizing_results' in st.session_state and st.session_state.sizing_results is n
             key='sort_by_select'
         )
 
-    # Apply filters
-    filtered_df = results_df.copy()
+    # Apply filters (masking and sorting return new frames, so no upfront copy)
+    filtered_df = results_df
     if filter_100_delivery:
         filtered_df = filtered_df[filtered_df['Delivery %'] >= 99.9]
     if filter_zero_dg:
@@ -518,15 +631,15 @@ if 'sizing_results' in st.session_state and st.session_state.sizing_results is n
 
         if len(full_delivery) > 0:
             # Smallest BESS with 100% delivery
-            min_bess = full_delivery.loc[full_delivery['BESS (MWh)'].idxmin()]
+            min_bess = full_delivery.iloc[full_delivery['BESS (MWh)'].to_numpy().argmin()]
             st.success(f"Smallest BESS for 100% delivery: **{min_bess['BESS (MWh)']:.0f} MWh** ({min_bess['Duration (hr)']}-hr) with {min_bess['Wastage %']:.1f}% wastage")
 
             # Lowest wastage with 100% delivery
-            min_waste = full_delivery.loc[full_delivery['Wastage %'].idxmin()]
+            min_waste = full_delivery.iloc[full_delivery['Wastage %'].to_numpy().argmin()]
             if min_waste['BESS (MWh)'] != min_bess['BESS (MWh)']:
                 st.info(f"Lowest wastage with 100% delivery: **{min_waste['BESS (MWh)']:.0f} MWh** ({min_waste['Duration (hr)']}-hr) with {min_waste['Wastage %']:.1f}% wastage")
         else:
-            max_delivery = filtered_df.loc[filtered_df['Delivery %'].idxmax()]
+            max_delivery = filtered_df.iloc[filtered_df['Delivery %'].to_numpy().argmax()]
             st.warning(f"No configuration achieves 100% delivery. Best: **{max_delivery['Delivery %']:.1f}%** with {max_delivery['BESS (MWh)']:.0f} MWh")
 
 
@@ -3,12 +3,15 @@ Step 4: Results & Quick Analysis
 View detailed simulation results with hourly dispatch visualization.
 """
 
+import copy
+import io
+
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from src.wizard_state import (
     init_wizard_state, get_wizard_state, get_step_status
@@ -16,7 +19,7 @@ from src.wizard_state import (
 from src.dispatch_engine import (
     SimulationParams, run_simulation, HourlyResult, calculate_metrics
 )
-from src.data_loader import load_solar_profile, load_solar_profile_by_name
+from src.data_loader import load_solar_profile, load_solar_profile_by_name, read_only_frame
 from src.load_builder import build_load_profile
 
 
@@ -66,11 +69,70 @@ CONTAINER_SPECS = {
     '5mwh_1.25mw': {'energy_mwh': 5, 'power_mw': 1.25, 'duration_hr': 4, 'label': '4-hour (0.25C)'},
 }
 
+# Hourly table status markers, indexed by a 4-bit state mask:
+# bit 0 = unmet, bit 1 = DG running, bit 2 = discharging, bit 3 = charging.
+# The lowest set bit wins, so unmet > DG > discharging > charging.
+HOURLY_STATUS_MARKERS = np.array(
+    [next((m for bit, m in enumerate(['🔴', '🟡', '🟣', '🟢']) if code >> bit & 1), '')
+     for code in range(16)]
+)
+
+# Hourly data table: display label -> source column, in display order.
+# Values are rounded to 1 decimal except for the index and state columns.
+HOURLY_DISPLAY_COLUMNS = {
+    'Hour': 'hour',
+    'Day': 'day',
+    'HoD': 'hour_of_day',
+    'Solar (MW)': 'solar_mw',
+    'DG (MW)': 'dg_output_mw',
+    'DG→Load': 'dg_to_load',
+    'DG→BESS': 'dg_to_bess',
+    'DG Curt': 'dg_curtailed',
+    'BESS (MW)': 'bess_mw',
+    'SOC (%)': 'soc_percent',
+    'BESS State': 'bess_state',
+    'DG State': 'dg_state',
+    'To Load (MW)': None,  # derived: solar + DG + BESS to load
+    'Unmet (MW)': 'unmet_mw',
+    'Delivery': 'delivery',
+}
+HOURLY_UNROUNDED_COLUMNS = {'Hour', 'Day', 'HoD', 'BESS State', 'DG State', 'Delivery'}
+HOURLY_ROUNDED_COLUMNS = [c for c in HOURLY_DISPLAY_COLUMNS if c not in HOURLY_UNROUNDED_COLUMNS]
+
+# Narrow dtypes for the hourly table's Arrow payload: small ints for the
+# indices, float32 for the 1-decimal values (shown with a fixed format) and
+# categoricals for the repeated labels.
+HOURLY_DISPLAY_DTYPES = {
+    'Hour': 'int16',
+    'Day': 'int16',
+    'HoD': 'int8',
+    'Status': 'category',
+    'BESS State': 'category',
+    'DG State': 'category',
+    'Delivery': 'category',
+    **{c: 'float32' for c in HOURLY_ROUNDED_COLUMNS},
+}
+HOURLY_DISPLAY_COLUMN_CONFIG = {
+    c: st.column_config.NumberColumn(c, format='%.1f') for c in HOURLY_ROUNDED_COLUMNS
+}
+
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+@st.cache_resource(show_spinner=False)
+def load_solar_file(filename=None):
+    """Read a solar profile CSV once per process (default profile when filename is None).
+
+    Returned as a shared read-only array; callers copy via tolist() before use.
+    """
+    solar_data = load_solar_profile_by_name(filename) if filename else load_solar_profile()
+    if solar_data is not None:
+        solar_data.setflags(write=False)
+    return solar_data
+
+
 def get_solar_profile(setup):
     """Get solar profile from setup configuration - matches Step 3 exactly."""
     solar_source = setup.get('solar_source', 'inputs')
@@ -87,7 +149,7 @@ def get_solar_profile(setup):
         selected_file = setup.get('solar_selected_file')
         if selected_file:
             try:
-                solar_data = load_solar_profile_by_name(selected_file)
+                solar_data = load_solar_file(selected_file)
                 if solar_data is not None and len(solar_data) > 0:
                     return solar_data[:8760].tolist() if len(solar_data) >= 8760 else solar_data.tolist()
             except Exception:
@@ -95,7 +157,7 @@ def get_solar_profile(setup):
 
     # Fallback: load default profile
     try:
-        solar_data = load_solar_profile()
+        solar_data = load_solar_file()
         if solar_data is not None and len(solar_data) > 0:
             return solar_data[:8760].tolist() if len(solar_data) >= 8760 else solar_data.tolist()
     except Exception:
@@ -128,11 +190,9 @@ def get_load_profile(setup):
     return build_load_profile(setup['load_mode'], load_params)
 
 
-def build_simulation_params(bess_mwh: float, bess_power_mw: float, dg_mw: float) -> SimulationParams:
+def build_simulation_params(bess_mwh: float, bess_power_mw: float, dg_mw: float,
+                            setup: dict, rules: dict) -> SimulationParams:
     """Build simulation parameters from wizard state - matches Step 3 exactly."""
-    setup = get_wizard_section('setup')
-    rules = get_wizard_section('rules')
-
     # Get profiles - matches Step 3
     load_profile = get_load_profile(setup)
     solar_profile = get_solar_profile(setup)
@@ -211,74 +271,239 @@ def find_cached_result(bess_mwh: float, dg_mw: float, container_type: str):
     return None
 
 
-def run_single_simulation(bess_mwh: float, container_type: str, dg_mw: float):
-    """Run a single simulation and return hourly results."""
+@st.cache_resource(max_entries=16, show_spinner=False)
+def simulate_configuration(bess_mwh: float, container_type: str, dg_mw: float,
+                           template_id: int, setup: dict, rules: dict):
+    """Run one configuration and return (hourly_df, metrics, monthly_df).
+
+    Cached on the configuration plus the setup/rules it was built from, so
+    revisiting a configuration skips the simulation, the DataFrame
+    conversion and the monthly aggregation. Held with st.cache_resource, so
+    the objects are shared by every session: both frames are read-only, so
+    an in-place write raises instead of changing other sessions' results.
+    Use run_single_simulation, which hands out per-call copies.
+    """
     spec = CONTAINER_SPECS.get(container_type, CONTAINER_SPECS['5mwh_2.5mw'])
 
     # Calculate power from energy and duration
     bess_power_mw = bess_mwh / spec['duration_hr']
 
-    params = build_simulation_params(bess_mwh, bess_power_mw, dg_mw)
-    template_id = get_template_id()
+    params = build_simulation_params(bess_mwh, bess_power_mw, dg_mw, setup, rules)
 
     hourly_results = run_simulation(params, template_id, num_hours=8760)
     metrics = calculate_metrics(hourly_results, params)
 
-    return hourly_results, metrics
+    hourly_df = hourly_results_to_dataframe(hourly_results)
+
+    return read_only_frame(hourly_df), metrics, read_only_frame(build_monthly_summary(hourly_df))
+
+
+def run_single_simulation(bess_mwh: float, container_type: str, dg_mw: float):
+    """Run a single simulation for the current wizard state and return (hourly_df, metrics, monthly_df).
+
+    The cached objects are shared across sessions, so the caller gets shallow
+    copies of the read-only frames: no data is duplicated, columns (or
+    metric fields) can be added or replaced, and in-place writes raise
+    instead of leaking into other sessions' results.
+    """
+    hourly_df, metrics, monthly_df = simulate_configuration(
+        bess_mwh, container_type, dg_mw, get_template_id(),
+        get_wizard_section('setup'), get_wizard_section('rules')
+    )
+    return hourly_df.copy(deep=False), copy.copy(metrics), monthly_df.copy(deep=False)
 
 
 def hourly_results_to_dataframe(hourly_results: list) -> pd.DataFrame:
-    """Convert hourly results to DataFrame - matches Quick Analysis format."""
-    data = []
-    start_date = datetime(2024, 1, 1)
-
-    for hr in hourly_results:
-        timestamp = start_date + timedelta(hours=hr.t - 1)
-        data.append({
-            'timestamp': timestamp,
-            'hour': hr.t,
-            'day': hr.day,
-            'hour_of_day': hr.hour_of_day,
-            'load_mw': hr.load,
-            'solar_mw': hr.solar,
-            'solar_to_load': hr.solar_to_load,
-            'solar_to_bess': hr.solar_to_bess,
-            'bess_to_load': hr.bess_to_load,
-            'bess_mw': hr.bess_power,
-            'bess_state': hr.bess_state,
-            'dg_output_mw': hr.dg_to_load + hr.dg_to_bess + hr.dg_curtailed,
-            'dg_state': 'ON' if hr.dg_running else 'OFF',
-            'dg_to_load': hr.dg_to_load,
-            'dg_to_bess': hr.dg_to_bess,
-            'dg_curtailed': hr.dg_curtailed,
-            'soc_mwh': hr.soc,
-            'soc_percent': hr.soc_pct,
-            'unmet_mw': hr.unserved,
-            'delivery': 'Yes' if (hr.load > 0 and hr.unserved < 0.001) else 'No',
-            'solar_curtailed': hr.solar_curtailed,
-            'daily_cycles': hr.daily_cycles,
+    """Convert hourly results to DataFrame - matches Quick Analysis format.
+
+    Columns are filled by index into preallocated NumPy arrays and assembled
+    in one pass, instead of building a dict per hour.
+    """
+    n = len(hourly_results)
+    float_cols = (
+        'load_mw', 'solar_mw', 'solar_to_load', 'solar_to_bess', 'bess_to_load',
+        'bess_mw', 'dg_to_load', 'dg_to_bess', 'dg_curtailed', 'soc_mwh',
+        'soc_percent', 'unmet_mw', 'solar_curtailed',
+    )
+    cols = {name: np.empty(n, dtype=np.float64) for name in float_cols}
+    hour = np.empty(n, dtype=np.int64)
+    day = np.empty(n, dtype=np.int64)
+    hour_of_day = np.empty(n, dtype=np.int64)
+    daily_cycles = np.empty(n, dtype=np.float64)
+    dg_running = np.empty(n, dtype=bool)
+    bess_state = [None] * n
+
+    for i, hr in enumerate(hourly_results):
+        hour[i] = hr.t
+        day[i] = hr.day
+        hour_of_day[i] = hr.hour_of_day
+        cols['load_mw'][i] = hr.load
+        cols['solar_mw'][i] = hr.solar
+        cols['solar_to_load'][i] = hr.solar_to_load
+        cols['solar_to_bess'][i] = hr.solar_to_bess
+        cols['bess_to_load'][i] = hr.bess_to_load
+        cols['bess_mw'][i] = hr.bess_power
+        cols['dg_to_load'][i] = hr.dg_to_load
+        cols['dg_to_bess'][i] = hr.dg_to_bess
+        cols['dg_curtailed'][i] = hr.dg_curtailed
+        cols['soc_mwh'][i] = hr.soc
+        cols['soc_percent'][i] = hr.soc_pct
+        cols['unmet_mw'][i] = hr.unserved
+        cols['solar_curtailed'][i] = hr.solar_curtailed
+        daily_cycles[i] = hr.daily_cycles
+        dg_running[i] = hr.dg_running
+        bess_state[i] = hr.bess_state
+
+    load = cols['load_mw']
+    unmet = cols['unmet_mw']
+
+    return pd.DataFrame({
+        'timestamp': pd.Timestamp(2024, 1, 1) + pd.to_timedelta(hour - 1, unit='h'),
+        'hour': hour,
+        'day': day,
+        'hour_of_day': hour_of_day,
+        'load_mw': load,
+        'solar_mw': cols['solar_mw'],
+        'solar_to_load': cols['solar_to_load'],
+        'solar_to_bess': cols['solar_to_bess'],
+        'bess_to_load': cols['bess_to_load'],
+        'bess_mw': cols['bess_mw'],
+        'bess_state': bess_state,
+        'dg_output_mw': cols['dg_to_load'] + cols['dg_to_bess'] + cols['dg_curtailed'],
+        'dg_state': np.where(dg_running, 'ON', 'OFF').astype(object),
+        'dg_to_load': cols['dg_to_load'],
+        'dg_to_bess': cols['dg_to_bess'],
+        'dg_curtailed': cols['dg_curtailed'],
+        'soc_mwh': cols['soc_mwh'],
+        'soc_percent': cols['soc_percent'],
+        'unmet_mw': unmet,
+        'delivery': np.where((load > 0) & (unmet < 0.001), 'Yes', 'No').astype(object),
+        'solar_curtailed': cols['solar_curtailed'],
+        'daily_cycles': daily_cycles,
+    })
+
+
+def build_monthly_summary(hourly_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate the hourly results into the monthly performance table."""
+    monthly_data = []
+    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+    for month_num in range(1, 13):
+        # Filter data for this month
+        month_mask = hourly_df['timestamp'].dt.month == month_num
+        month_df = hourly_df[month_mask]
+
+        if len(month_df) == 0:
+            continue
+
+        # Calculate metrics for this month
+        month_hours = len(month_df)
+        month_load_hours = (month_df['load_mw'] > 0).sum()
+        month_delivery = (month_df['delivery'] == 'Yes').sum()
+        month_dg_hours = (month_df['dg_state'] == 'ON').sum()
+        month_solar = month_df['solar_mw'].sum()
+        month_curtailed = month_df['solar_curtailed'].sum()
+
+        # Energy-based calculations (MWh per month)
+        month_green_energy = month_df['solar_to_load'].sum() + month_df['bess_to_load'].sum()
+        month_dg_energy = month_df['dg_to_load'].sum()
+
+        effective_hours = month_load_hours if month_load_hours > 0 else month_hours
+        delivery_pct = (month_delivery / effective_hours * 100) if effective_hours > 0 else 0
+        green_delivery = month_delivery - month_dg_hours  # Approximate green hours
+        green_pct = (green_delivery / month_delivery * 100) if month_delivery > 0 else 0
+        wastage_pct = (month_curtailed / month_solar * 100) if month_solar > 0 else 0
+
+        monthly_data.append({
+            'Month': month_names[month_num - 1],
+            'Delivery %': delivery_pct,
+            'Green %': max(0, green_pct),
+            'Wastage %': wastage_pct,
+            'Delivery Hrs': int(month_delivery),
+            'Load Hrs': int(month_load_hours),
+            'DG Hrs': int(month_dg_hours),
+            'Green Energy to Load (MWh)': month_green_energy,
+            'DG to Load (MWh)': month_dg_energy,
+            'Curtailed (MWh)': month_curtailed,
         })
 
-    return pd.DataFrame(data)
+    # Round once per column rather than per month inside the loop
+    return pd.DataFrame(monthly_data).round({
+        'Delivery %': 1,
+        'Green %': 1,
+        'Wastage %': 1,
+        'Green Energy to Load (MWh)': 1,
+        'DG to Load (MWh)': 1,
+        'Curtailed (MWh)': 1,
+    })
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def build_hourly_display_df(filtered_df: pd.DataFrame) -> pd.DataFrame:
+    """Select, rename and round the hourly columns shown in the data table.
+
+    Cached on the filtered slice so reruns that keep the date range skip
+    the rebuild; the result is only passed to st.dataframe, so it is shared
+    via st.cache_resource rather than copied on every hit. Row state is
+    shown as a leading status marker column rather than Styler row colors,
+    so the table stays on the Arrow path, and columns are narrowed to
+    ``HOURLY_DISPLAY_DTYPES`` to shrink that payload.
+    """
+    columns = {}
+    for label, source in HOURLY_DISPLAY_COLUMNS.items():
+        if source is None:
+            values = filtered_df['solar_to_load'] + filtered_df['dg_to_load'] + filtered_df['bess_to_load']
+        else:
+            values = filtered_df[source]
+        columns[label] = values if label in HOURLY_UNROUNDED_COLUMNS else values.round(1)
 
+    display_df = pd.DataFrame(columns, index=filtered_df.index)
+    display_df.insert(0, 'Status', hourly_status_markers(display_df))
+    return display_df.astype(HOURLY_DISPLAY_DTYPES)
 
-def style_hourly_row(row):
-    """Color-code rows based on state."""
-    if 'Unmet (MW)' in row.index and row['Unmet (MW)'] > 0:
-        return ['background-color: #FFB6C1'] * len(row)
-    if 'DG (MW)' in row.index and row['DG (MW)'] > 0:
-        return ['background-color: #FFFACD'] * len(row)
-    if 'BESS State' in row.index:
-        if row['BESS State'] == 'Discharging':
-            return ['background-color: #E6E6FA'] * len(row)
-        if row['BESS State'] == 'Charging':
-            return ['background-color: #90EE90'] * len(row)
-    return [''] * len(row)
 
+def hourly_status_markers(df: pd.DataFrame) -> np.ndarray:
+    """Return one status marker per row of the hourly display table.
+
+    The four row conditions are packed into one small integer per row,
+    which indexes the precomputed 16-entry ``HOURLY_STATUS_MARKERS``
+    table; no per-row branching.
+    """
+    state = df['BESS State'].to_numpy()
+
+    codes = (
+        (df['Unmet (MW)'].to_numpy() > 0).astype(np.uint8)
+        | (df['DG (MW)'].to_numpy() > 0).astype(np.uint8) << 1
+        | (state == 'Discharging').astype(np.uint8) << 2
+        | (state == 'Charging').astype(np.uint8) << 3
+    )
+    return HOURLY_STATUS_MARKERS[codes]
 
-def create_dispatch_graph(hourly_df: pd.DataFrame, load_mw: float, bess_capacity: float = 100,
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def hourly_export_csv(hourly_df: pd.DataFrame) -> bytes:
+    """Encode hourly results as CSV bytes, with the energy-to-load export columns.
+
+    Written straight into a bytes buffer and cached on the frame, so the
+    download buttons do not re-serialize 8760 rows on every rerun.
+    """
+    export_df = hourly_df.assign(
+        Green_Energy_to_Load_MWh=(hourly_df['solar_to_load'] + hourly_df['bess_to_load']).round(3),
+        DG_to_Load_MWh=hourly_df['dg_to_load'].round(3),
+    )
+    buffer = io.BytesIO()
+    export_df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def create_dispatch_graph(hourly_df: pd.DataFrame, load_mw: float,
                           soc_on: float = 30, soc_off: float = 80) -> go.Figure:
-    """Create dispatch visualization with dual y-axis - matches Quick Analysis."""
+    """Create dispatch visualization with dual y-axis - matches Quick Analysis.
+
+    Cached on the plotted slice and thresholds, so reruns that keep the same
+    date range reuse the built figure instead of re-adding every trace.
+    """
     fig = make_subplots(specs=[[{"secondary_y": True}]])
 
     hours = list(range(len(hourly_df)))
@@ -320,11 +545,11 @@ def create_dispatch_graph(hourly_df: pd.DataFrame, load_mw: float, bess_capacity
             hovertemplate='Hour %{x}<br>SOC: %{y:.1f}%<extra></extra>'
         ), secondary_y=True)
 
-    # BESS Energy (MWh)
-    if 'soc_percent' in hourly_df.columns:
-        bess_energy = hourly_df['soc_percent'].values * bess_capacity / 100
+    # BESS Energy (MWh) - plotted straight from the simulated SoC rather than
+    # converting the percentage back through the capacity
+    if 'soc_mwh' in hourly_df.columns:
         fig.add_trace(go.Scatter(
-            x=hours, y=bess_energy,
+            x=hours, y=hourly_df['soc_mwh'].values,
             name='BESS Energy (MWh)',
             line=dict(color='#4169E1', width=2, dash='dash', shape='hv'),
             hovertemplate='Hour %{x}<br>Energy: %{y:.1f} MWh<extra></extra>'
@@ -497,14 +722,13 @@ if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
 if 'analysis_hourly_df' not in st.session_state:
     st.session_state.analysis_hourly_df = None
+if 'analysis_monthly_df' not in st.session_state:
+    st.session_state.analysis_monthly_df = None
 
 if run_button:
     with st.spinner("Running 8760-hour simulation..." if not cached else "Loading results..."):
         try:
-            hourly_results, metrics = run_single_simulation(bess_mwh, selected_container, dg_mw)
-
-            # Convert to DataFrame
-            hourly_df = hourly_results_to_dataframe(hourly_results)
+            hourly_df, metrics, monthly_df = run_single_simulation(bess_mwh, selected_container, dg_mw)
 
             # Store in session state
             st.session_state.analysis_results = {
@@ -514,6 +738,7 @@ if run_button:
                 'container_type': selected_container,
             }
             st.session_state.analysis_hourly_df = hourly_df
+            st.session_state.analysis_monthly_df = monthly_df
 
             st.success("Simulation complete!")
             st.rerun()
@@ -570,50 +795,9 @@ if st.session_state.analysis_results is not None:
     st.divider()
     st.subheader("Monthly Performance Summary")
 
-    # Calculate monthly metrics
-    monthly_data = []
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-
-    for month_num in range(1, 13):
-        # Filter data for this month
-        month_mask = hourly_df['timestamp'].dt.month == month_num
-        month_df = hourly_df[month_mask]
-
-        if len(month_df) == 0:
-            continue
-
-        # Calculate metrics for this month
-        month_hours = len(month_df)
-        month_load_hours = (month_df['load_mw'] > 0).sum()
-        month_delivery = (month_df['delivery'] == 'Yes').sum()
-        month_dg_hours = (month_df['dg_state'] == 'ON').sum()
-        month_solar = month_df['solar_mw'].sum()
-        month_curtailed = month_df['solar_curtailed'].sum()
-
-        # Energy-based calculations (MWh per month)
-        month_green_energy = month_df['solar_to_load'].sum() + month_df['bess_to_load'].sum()
-        month_dg_energy = month_df['dg_to_load'].sum()
-
-        effective_hours = month_load_hours if month_load_hours > 0 else month_hours
-        delivery_pct = (month_delivery / effective_hours * 100) if effective_hours > 0 else 0
-        green_delivery = month_delivery - month_dg_hours  # Approximate green hours
-        green_pct = (green_delivery / month_delivery * 100) if month_delivery > 0 else 0
-        wastage_pct = (month_curtailed / month_solar * 100) if month_solar > 0 else 0
-
-        monthly_data.append({
-            'Month': month_names[month_num - 1],
-            'Delivery %': round(delivery_pct, 1),
-            'Green %': round(max(0, green_pct), 1),
-            'Wastage %': round(wastage_pct, 1),
-            'Delivery Hrs': int(month_delivery),
-            'Load Hrs': int(month_load_hours),
-            'DG Hrs': int(month_dg_hours),
-            'Green Energy to Load (MWh)': round(month_green_energy, 1),
-            'DG to Load (MWh)': round(month_dg_energy, 1),
-            'Curtailed (MWh)': round(month_curtailed, 1),
-        })
-
-    monthly_df = pd.DataFrame(monthly_data)
+    monthly_df = st.session_state.get('analysis_monthly_df')
+    if monthly_df is None:
+        monthly_df = build_monthly_summary(hourly_df)
 
     st.dataframe(
         monthly_df,
@@ -715,7 +899,7 @@ if st.session_state.analysis_results is not None:
     else:
         # Filter data by date range
         mask = (hourly_df['timestamp'] >= start_dt) & (hourly_df['timestamp'] <= end_dt)
-        filtered_df = hourly_df[mask].copy()
+        filtered_df = hourly_df[mask]
 
         # Calculate days in range
         days_in_range = (end_dt - start_dt).days + 1
@@ -749,7 +933,7 @@ if st.session_state.analysis_results is not None:
         soc_off = rules.get('soc_off_threshold', 80)
 
         # Dispatch graph
-        fig = create_dispatch_graph(filtered_df, load_mw, bess_capacity, soc_on, soc_off)
+        fig = create_dispatch_graph(filtered_df, load_mw, soc_on, soc_off)
         st.plotly_chart(fig, use_container_width=True)
 
         st.caption("""
@@ -760,36 +944,12 @@ if st.session_state.analysis_results is not None:
         # Styled Hourly Data Table (always visible)
         st.subheader("📊 Hourly Data Table")
 
-        display_df = filtered_df.copy()
-        display_df['Hour'] = display_df['hour']
-        display_df['Day'] = display_df['day']
-        display_df['HoD'] = display_df['hour_of_day']
-        display_df['Solar (MW)'] = display_df['solar_mw'].round(1)
-        display_df['DG (MW)'] = display_df['dg_output_mw'].round(1)
-        display_df['DG→Load'] = display_df['dg_to_load'].round(1)
-        display_df['DG→BESS'] = display_df['dg_to_bess'].round(1)
-        display_df['DG Curt'] = display_df['dg_curtailed'].round(1)
-        display_df['BESS (MW)'] = display_df['bess_mw'].round(1)
-        display_df['SOC (%)'] = display_df['soc_percent'].round(1)
-        display_df['BESS State'] = display_df['bess_state']
-        display_df['DG State'] = display_df['dg_state']
-        display_df['To Load (MW)'] = (display_df['solar_to_load'] + display_df['dg_to_load'] + display_df['bess_to_load']).round(1)
-        display_df['Unmet (MW)'] = display_df['unmet_mw'].round(1)
-        display_df['Delivery'] = display_df['delivery']
-
-        display_cols = [
-            'Hour', 'Day', 'HoD',
-            'Solar (MW)', 'DG (MW)', 'DG→Load', 'DG→BESS', 'DG Curt',
-            'BESS (MW)', 'SOC (%)',
-            'BESS State', 'DG State',
-            'To Load (MW)', 'Unmet (MW)', 'Delivery'
-        ]
-
-        styled_df = display_df[display_cols].style.apply(style_hourly_row, axis=1)
-        st.dataframe(styled_df, use_container_width=True, height=400)
+        display_df = build_hourly_display_df(filtered_df)
+        st.dataframe(display_df, use_container_width=True, height=400,
+                     column_config=HOURLY_DISPLAY_COLUMN_CONFIG)
 
         st.markdown("""
-        **Row Colors:** 🟢 Green = Charging | 🟣 Lavender = Discharging | 🟡 Yellow = DG Running | 🔴 Pink = Unmet Load
+        **Status:** 🟢 Charging | 🟣 Discharging | 🟡 DG Running | 🔴 Unmet Load
         """)
 
         # Export buttons
@@ -799,34 +959,18 @@ if st.session_state.analysis_results is not None:
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            # Prepare hourly export with energy columns
-            hourly_export_df = filtered_df.copy()
-            hourly_export_df['Green_Energy_to_Load_MWh'] = (
-                hourly_export_df['solar_to_load'] + hourly_export_df['bess_to_load']
-            ).round(3)
-            hourly_export_df['DG_to_Load_MWh'] = hourly_export_df['dg_to_load'].round(3)
-
-            csv_data = hourly_export_df.to_csv(index=False)
             st.download_button(
                 "📥 Hourly Data (Selected Range)",
-                data=csv_data,
+                data=hourly_export_csv(filtered_df),
                 file_name=f"hourly_{bess_capacity}mwh_{start_date}_to_{end_date}.csv",
                 mime="text/csv",
                 use_container_width=True
             )
 
         with col2:
-            # Full year hourly export with energy columns
-            full_year_export = hourly_df.copy()
-            full_year_export['Green_Energy_to_Load_MWh'] = (
-                full_year_export['solar_to_load'] + full_year_export['bess_to_load']
-            ).round(3)
-            full_year_export['DG_to_Load_MWh'] = full_year_export['dg_to_load'].round(3)
-
-            full_year_csv = full_year_export.to_csv(index=False)
             st.download_button(
                 "📥 Hourly Data (Full Year)",
-                data=full_year_csv,
+                data=hourly_export_csv(hourly_df),
                 file_name=f"hourly_{bess_capacity}mwh_full_year.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -9,7 +9,6 @@ import pandas as pd
 import math
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta, date
 
 from src.wizard_state import (
     init_wizard_state, get_wizard_state, get_step_status
@@ -201,6 +200,44 @@ def convert_results_to_dataframe(hourly_results):
     } for h in hourly_results])
 
 
+def summarize_projection_months(monthly_frames):
+    """Aggregate per-year hourly flags into one row per (year, month).
+
+    The yearly frames are stacked and reduced with a single groupby instead
+    of filtering each year twelve times.
+    """
+    stacked = pd.concat(monthly_frames, ignore_index=True)
+    grouped = stacked.groupby(['Year', 'month']).agg(
+        Capacity_MWh=('Capacity_MWh', 'first'),
+        Delivery_Hrs=('delivered', 'sum'),
+        DG_Hrs=('dg_on', 'sum'),
+        solar_gen=('solar_mw', 'sum'),
+        curtailed=('solar_curtailed', 'sum'),
+        solar_to_load=('solar_to_load', 'sum'),
+        bess_to_load=('bess_to_load', 'sum'),
+        dg_to_load=('dg_to_load', 'sum'),
+    ).reset_index()
+
+    month_idx = grouped['month'].to_numpy()
+    solar_gen = grouped['solar_gen'].to_numpy()
+    curtailed = grouped['curtailed'].to_numpy()
+    wastage = np.divide(curtailed * 100, solar_gen, out=np.zeros_like(curtailed), where=solar_gen > 0)
+
+    return pd.DataFrame({
+        'Year': grouped['Year'],
+        'Month': np.array(MONTH_NAMES)[month_idx],
+        'Month_Num': month_idx + 1,
+        'Capacity_MWh': grouped['Capacity_MWh'],
+        'Delivery_Hrs': grouped['Delivery_Hrs'],
+        'Delivery_%': grouped['Delivery_Hrs'] / np.array(HOURS_PER_MONTH)[month_idx] * 100,
+        'DG_Hrs': grouped['DG_Hrs'],
+        'Green_Energy_to_Load_MWh': grouped['solar_to_load'] + grouped['bess_to_load'],
+        'DG_to_Load_MWh': grouped['dg_to_load'],
+        'Curtailed_MWh': curtailed,
+        'Wastage_%': wastage,
+    })
+
+
 # =============================================================================
 # MAIN PAGE
 # =============================================================================
@@ -426,9 +463,14 @@ if run_projection:
     progress_bar = st.progress(0, text="Simulating Year 1...")
 
     yearly_projection_data = []
-    monthly_20yr_data = []
+    monthly_frames = []
     carryover_energy_mwh = None
 
+    # Month of each simulated hour is identical every year, so build it once.
+    # Years themselves stay sequential: each starts from the previous year's SOC.
+    hour_days = pd.to_timedelta(np.arange(1, 8761) // 24, unit='D')
+    month_of_hour = np.minimum(11, (pd.Timestamp(2023, 1, 1) + hour_days).month - 1)
+
     for year in range(1, 21):
         progress_bar.progress(year / 20, text=f"Simulating Year {year}...")
 
@@ -455,9 +497,7 @@ if run_projection:
         year_df = convert_results_to_dataframe(year_results)
 
         # Add month column
-        year_df['month'] = year_df['hour'].apply(
-            lambda h: min(11, (date(2023, 1, 1) + timedelta(hours=h)).month - 1)
-        )
+        year_df['month'] = month_of_hour
 
         # Calculate year metrics
         year_solar_gen = year_df['solar_mw'].sum()
@@ -501,20 +541,20 @@ if run_projection:
 
         yearly_projection_data.append({
             'Year': year,
-            'Capacity (MWh)': round(effective_capacity, 1),
-            'Capacity %': round(capacity_factor * 100, 1),
+            'Capacity (MWh)': effective_capacity,
+            'Capacity %': capacity_factor * 100,
             'Delivery Hrs': year_delivery_hrs,
             'Load Hrs': year_load_hrs,
             'Delivery %': delivery_pct,
             'DG Hrs': year_dg_hrs,
-            'Green Energy to Load (MWh)': round(year_green_energy_to_load, 1),
-            'DG to Load (MWh)': round(year_dg_to_load, 1),
+            'Green Energy to Load (MWh)': year_green_energy_to_load,
+            'DG to Load (MWh)': year_dg_to_load,
             'Solar Hrs': year_solar_hrs,
             'BESS Hrs': year_bess_hrs,
-            'Curtailed (MWh)': round(year_solar_curtailed, 0),
-            'Total Wastage %': round(year_wastage_pct, 1),
-            'Load Wastage %': round(year_load_wastage_pct, 1),
-            'BESS Loss (MWh)': round(year_charging_loss + year_discharging_loss, 0),
+            'Curtailed (MWh)': year_solar_curtailed,
+            'Total Wastage %': year_wastage_pct,
+            'Load Wastage %': year_load_wastage_pct,
+            'BESS Loss (MWh)': year_charging_loss + year_discharging_loss,
             # Energy summary fields (hidden from export)
             '_solar_gen': year_solar_gen,
             '_dg_gen': year_dg_gen,
@@ -536,40 +576,42 @@ if run_projection:
         # Save carryover for next year
         carryover_energy_mwh = effective_capacity * year_final_soc_pct
 
-        # Monthly data
-        for month_idx in range(12):
-            month_data = year_df[year_df['month'] == month_idx]
-            month_delivery_hrs = (month_data['delivery'] == 'Yes').sum()
-            month_dg_hrs = (month_data['dg_state'] == 'ON').sum()
-            month_curtailed = month_data['solar_curtailed'].sum()
-            month_solar_gen = month_data['solar_mw'].sum()
-            month_wastage_pct = (month_curtailed / month_solar_gen * 100) if month_solar_gen > 0 else 0
-
-            # Energy-based calculations for monthly data
-            month_solar_to_load = month_data['solar_to_load'].sum()
-            month_bess_to_load = month_data['bess_to_load'].sum()
-            month_dg_to_load = month_data['dg_to_load'].sum()
-            month_green_energy = month_solar_to_load + month_bess_to_load
-
-            monthly_20yr_data.append({
-                'Year': year,
-                'Month': MONTH_NAMES[month_idx],
-                'Month_Num': month_idx + 1,
-                'Capacity_MWh': round(effective_capacity, 1),
-                'Delivery_Hrs': month_delivery_hrs,
-                'Delivery_%': round(month_delivery_hrs / HOURS_PER_MONTH[month_idx] * 100, 1),
-                'DG_Hrs': month_dg_hrs,
-                'Green_Energy_to_Load_MWh': round(month_green_energy, 1),
-                'DG_to_Load_MWh': round(month_dg_to_load, 1),
-                'Curtailed_MWh': round(month_curtailed, 1),
-                'Wastage_%': round(month_wastage_pct, 1),
-            })
+        # Monthly data: keep this year's hourly flags; all years are aggregated in one pass below
+        monthly_frames.append(pd.DataFrame({
+            'Year': year,
+            'month': month_of_hour,
+            'Capacity_MWh': effective_capacity,
+            'delivered': year_df['delivery'].eq('Yes'),
+            'dg_on': year_df['dg_state'].eq('ON'),
+            'solar_mw': year_df['solar_mw'],
+            'solar_curtailed': year_df['solar_curtailed'],
+            'solar_to_load': year_df['solar_to_load'],
+            'bess_to_load': year_df['bess_to_load'],
+            'dg_to_load': year_df['dg_to_load'],
+        }))
 
     progress_bar.progress(1.0, text="Complete!")
 
     # Store results
-    st.session_state.multiyear_yearly = pd.DataFrame(yearly_projection_data)
-    st.session_state.multiyear_monthly = pd.DataFrame(monthly_20yr_data)
+    # Round once per column rather than per row inside the year/month loops
+    st.session_state.multiyear_yearly = pd.DataFrame(yearly_projection_data).round({
+        'Capacity (MWh)': 1,
+        'Capacity %': 1,
+        'Green Energy to Load (MWh)': 1,
+        'DG to Load (MWh)': 1,
+        'Curtailed (MWh)': 0,
+        'Total Wastage %': 1,
+        'Load Wastage %': 1,
+        'BESS Loss (MWh)': 0,
+    })
+    st.session_state.multiyear_monthly = summarize_projection_months(monthly_frames).round({
+        'Capacity_MWh': 1,
+        'Delivery_%': 1,
+        'Green_Energy_to_Load_MWh': 1,
+        'DG_to_Load_MWh': 1,
+        'Curtailed_MWh': 1,
+        'Wastage_%': 1,
+    })
 
     st.success("20-year projection complete!")
     st.rerun()
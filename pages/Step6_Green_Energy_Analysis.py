@@ -5,14 +5,18 @@ Step 6: Green Energy Analysis
 meeting green energy targets with acceptable wastage.
 """
 
+import io
+from operator import attrgetter
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
 from src.wizard_state import get_wizard_state
-from src.data_loader import load_solar_profile_by_name, get_base_solar_peak_capacity
-from src.load_builder import build_load_profile
+from src.data_loader import load_solar_profile_by_name, get_base_solar_peak_capacity, read_only_frame
+from src.load_builder import build_load_profile, MONTH_OF_HOUR
 from src.green_energy_optimizer import (
     run_green_energy_optimization,
     GreenEnergyOptimizationParams,
@@ -84,6 +88,170 @@ def get_solar_profile(setup):
     return None
 
 
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_solar_file(filename):
+    """Read an Inputs/ solar profile and its peak once per process.
+
+    Returns ``(profile, peak_mw)``; the profile is a shared read-only array
+    (None when the file cannot be read).
+    """
+    profile = load_solar_profile_by_name(filename)
+    return profile, get_base_solar_peak_capacity(profile)
+
+
+def get_base_solar(setup):
+    """Resolve the Step 1 solar selection to ``(profile, peak_mw)`` for sweeping and scaling."""
+    solar_source = setup.get('solar_source', 'inputs')
+    if solar_source in ('inputs', 'file', 'default'):
+        return load_solar_file(setup.get('solar_selected_file', 'Solar Profile.csv'))
+
+    if solar_source == 'upload' and setup.get('solar_csv_data') is not None:
+        solar_data = setup['solar_csv_data']
+        if isinstance(solar_data, list):
+            profile = solar_data[:8760] if len(solar_data) >= 8760 else solar_data
+        else:
+            profile = solar_data[:8760].tolist() if len(solar_data) >= 8760 else solar_data.tolist()
+        return profile, get_base_solar_peak_capacity(profile)
+
+    # Fallback to default
+    return load_solar_file('Solar Profile.csv')
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def cached_hourly_dispatch(solar_mwp, bess_mwh, duration_hr, dg_mw, setup, rules):
+    """Run the 8760-hour dispatch for one swept configuration as a DataFrame.
+
+    Pure (no Streamlit output) and cached on the configuration plus the
+    setup/rules it was built from, so pressing "Generate Hourly Dispatch"
+    again for the same selection skips the simulation. Held with
+    st.cache_resource, so the frame is shared by every session and is
+    read-only: an in-place write raises instead of changing other
+    sessions' results. Use simulate_hourly_dispatch, which hands out a
+    per-call copy.
+    """
+    base_solar_profile, base_solar_capacity = get_base_solar(setup)
+
+    # Scale solar to selected capacity
+    from src.data_loader import scale_solar_profile
+    scaled_solar = scale_solar_profile(
+        base_solar_profile,
+        base_solar_capacity,
+        solar_mwp
+    )
+
+    # Build load profile
+    load_profile = get_load_profile(setup)
+
+    # Get BESS power from duration
+    power_mw = bess_mwh / duration_hr if bess_mwh > 0 else 0
+
+    # Build simulation params
+    from src.dispatch_engine import SimulationParams, run_simulation
+
+    sim_params = SimulationParams(
+        load_profile=load_profile.tolist() if hasattr(load_profile, 'tolist') else load_profile,
+        solar_profile=scaled_solar,
+        bess_capacity=bess_mwh,
+        bess_charge_power=power_mw,
+        bess_discharge_power=power_mw,
+        bess_efficiency=setup.get('bess_efficiency', 87),
+        bess_min_soc=setup.get('bess_min_soc', 5),
+        bess_max_soc=setup.get('bess_max_soc', 95),
+        bess_initial_soc=setup.get('bess_initial_soc', 50),
+        bess_daily_cycle_limit=setup.get('bess_daily_cycle_limit', 2.0),
+        bess_enforce_cycle_limit=setup.get('bess_enforce_cycle_limit', False),
+        dg_enabled=setup.get('dg_enabled', False) and dg_mw > 0,
+        dg_capacity=dg_mw,
+        dg_charges_bess=rules.get('dg_charges_bess', False),
+        dg_load_priority=rules.get('dg_load_priority', 'bess_first'),
+        dg_takeover_mode=rules.get('dg_takeover_mode', False),
+        night_start_hour=rules.get('night_start', 18),
+        night_end_hour=rules.get('night_end', 6),
+        day_start_hour=rules.get('day_start', 6),
+        day_end_hour=rules.get('day_end', 18),
+        blackout_start_hour=rules.get('blackout_start', 0),
+        blackout_end_hour=rules.get('blackout_end', 0),
+        dg_soc_on_threshold=rules.get('soc_on_threshold', 30),
+        dg_soc_off_threshold=rules.get('soc_off_threshold', 80),
+        dg_fuel_curve_enabled=setup.get('dg_fuel_curve_enabled', False),
+        dg_fuel_f0=setup.get('dg_fuel_f0', 0.03),
+        dg_fuel_f1=setup.get('dg_fuel_f1', 0.22),
+        dg_fuel_flat_rate=setup.get('dg_fuel_flat_rate', 0.25),
+        cycle_charging_enabled=rules.get('cycle_charging_enabled', False),
+        cycle_charging_min_load_pct=rules.get('cycle_charging_min_load_pct', 70.0),
+        cycle_charging_off_soc=rules.get('cycle_charging_off_soc', 80.0),
+    )
+
+    # Run simulation
+    template_id = parse_template_id(rules.get('inferred_template', 'T0'))
+    hourly_results = run_simulation(sim_params, template_id, num_hours=8760)
+
+    # Convert to DataFrame: fill one preallocated array per field, then
+    # derive the combined and Yes/No columns with whole-array operations
+    n = len(hourly_results)
+    fields = (
+        'load', 'solar', 'solar_to_load', 'solar_to_bess', 'solar_curtailed',
+        'bess_to_load', 'soc_pct', 'dg_to_load', 'dg_to_bess', 'dg_output_mw',
+        'dg_fuel_consumed', 'unserved', 'daily_cycles',
+    )
+    cols = {
+        name: np.fromiter(map(attrgetter(name), hourly_results), dtype=np.float64, count=n)
+        for name in fields
+    }
+    hour = np.fromiter(map(attrgetter('t'), hourly_results), dtype=np.int64, count=n)
+    day = np.fromiter(map(attrgetter('day'), hourly_results), dtype=np.int64, count=n)
+    hour_of_day = np.fromiter(map(attrgetter('hour_of_day'), hourly_results), dtype=np.int64, count=n)
+    dg_running = np.fromiter(map(attrgetter('dg_running'), hourly_results), dtype=bool, count=n)
+
+    full_delivery = (cols['unserved'] == 0) & (cols['load'] > 0)
+    green_delivery = full_delivery & (cols['dg_to_load'] == 0)
+
+    def yes_no(mask):
+        return np.where(mask, 'Yes', 'No').astype(object)
+
+    return read_only_frame(pd.DataFrame({
+        'Hour': hour,
+        'Day': day,
+        'Hour_of_Day': hour_of_day,
+        'Load_MW': cols['load'],
+        'Solar_MW': cols['solar'],
+        'Solar_to_Load_MW': cols['solar_to_load'],
+        'Solar_to_BESS_MW': cols['solar_to_bess'],
+        'Solar_Curtailed_MW': cols['solar_curtailed'],
+        'BESS_to_Load_MW': cols['bess_to_load'],
+        'BESS_Charge_MW': cols['solar_to_bess'] + cols['dg_to_bess'],
+        'BESS_SOC_pct': cols['soc_pct'],
+        'DG_to_Load_MW': cols['dg_to_load'],
+        'DG_to_BESS_MW': cols['dg_to_bess'],
+        'DG_Output_MW': cols['dg_output_mw'],
+        'DG_Fuel_L': cols['dg_fuel_consumed'],
+        'Load_Served_MW': cols['solar_to_load'] + cols['bess_to_load'] + cols['dg_to_load'],
+        'Unserved_MW': cols['unserved'],
+        'Full_Delivery': yes_no(full_delivery),
+        'Green_Delivery': yes_no(green_delivery),
+        'DG_Running': yes_no(dg_running),
+        'Daily_Cycles': cols['daily_cycles'],
+    }))
+
+
+def simulate_hourly_dispatch(solar_mwp, bess_mwh, duration_hr, dg_mw, setup, rules):
+    """Hourly dispatch for one configuration, as this caller's own frame.
+
+    A shallow copy of the shared read-only frame: no data is duplicated,
+    columns can be added or replaced, and in-place writes raise instead of
+    leaking into other sessions' results.
+    """
+    return cached_hourly_dispatch(solar_mwp, bess_mwh, duration_hr, dg_mw, setup, rules).copy(deep=False)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def hourly_dispatch_csv(hourly_df: pd.DataFrame) -> bytes:
+    """Encode the hourly dispatch table as CSV bytes, cached on its contents."""
+    buffer = io.BytesIO()
+    hourly_df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+
 def main():
     st.title("Green Energy Analysis")
     st.markdown("""
@@ -334,26 +502,12 @@ def main():
         # Load data
         with st.spinner("Loading solar and load profiles..."):
             # Load solar profile
-            solar_source = setup.get('solar_source', 'inputs')
-            if solar_source in ('inputs', 'file', 'default'):
-                solar_file = setup.get('solar_selected_file', 'Solar Profile.csv')
-                base_solar_profile = load_solar_profile_by_name(solar_file)
-            elif solar_source == 'upload' and setup.get('solar_csv_data') is not None:
-                solar_data = setup['solar_csv_data']
-                if isinstance(solar_data, list):
-                    base_solar_profile = solar_data[:8760] if len(solar_data) >= 8760 else solar_data
-                else:
-                    base_solar_profile = solar_data[:8760].tolist() if len(solar_data) >= 8760 else solar_data.tolist()
-            else:
-                # Fallback to default
-                base_solar_profile = load_solar_profile_by_name('Solar Profile.csv')
+            base_solar_profile, base_solar_capacity = get_base_solar(setup)
 
             if base_solar_profile is None or len(base_solar_profile) == 0:
                 st.error("Failed to load solar profile. Please check Step 1 configuration.")
                 return
 
-            base_solar_capacity = get_base_solar_peak_capacity(base_solar_profile)
-
             if base_solar_capacity <= 0:
                 st.error("Solar profile has no generation data (peak capacity is 0). Please check your solar profile in Step 1.")
                 return
@@ -834,114 +988,24 @@ def main():
 
         if selected_row is not None and st.button("Generate Hourly Dispatch", type="primary", key='gen_hourly'):
             with st.spinner("Generating 8760-hour dispatch simulation..."):
-                # Re-run simulation for selected config to get hourly data
-                solar_source = setup.get('solar_source', 'inputs')
-                if solar_source in ('inputs', 'file', 'default'):
-                    solar_file = setup.get('solar_selected_file', 'Solar Profile.csv')
-                    base_solar_profile = load_solar_profile_by_name(solar_file)
-                elif solar_source == 'upload' and setup.get('solar_csv_data') is not None:
-                    solar_data = setup['solar_csv_data']
-                    if isinstance(solar_data, list):
-                        base_solar_profile = solar_data[:8760] if len(solar_data) >= 8760 else solar_data
-                    else:
-                        base_solar_profile = solar_data[:8760].tolist() if len(solar_data) >= 8760 else solar_data.tolist()
-                else:
-                    base_solar_profile = load_solar_profile_by_name('Solar Profile.csv')
-
-                base_solar_capacity = get_base_solar_peak_capacity(base_solar_profile)
-
-                # Scale solar to selected capacity
-                from src.data_loader import scale_solar_profile
-                scaled_solar = scale_solar_profile(
-                    base_solar_profile,
-                    base_solar_capacity,
-                    selected_solar
+                hourly_df = simulate_hourly_dispatch(
+                    selected_solar, selected_bess, selected_duration, selected_dg, setup, rules
                 )
 
-                # Build load profile
-                load_profile = get_load_profile(setup)
-
-                # Get BESS power from duration
-                power_mw = selected_bess / selected_duration if selected_bess > 0 else 0
-
-                # Build simulation params
-                from src.dispatch_engine import SimulationParams, run_simulation
-
-                sim_params = SimulationParams(
-                    load_profile=load_profile.tolist() if hasattr(load_profile, 'tolist') else load_profile,
-                    solar_profile=scaled_solar,
-                    bess_capacity=selected_bess,
-                    bess_charge_power=power_mw,
-                    bess_discharge_power=power_mw,
-                    bess_efficiency=setup.get('bess_efficiency', 87),
-                    bess_min_soc=setup.get('bess_min_soc', 5),
-                    bess_max_soc=setup.get('bess_max_soc', 95),
-                    bess_initial_soc=setup.get('bess_initial_soc', 50),
-                    bess_daily_cycle_limit=setup.get('bess_daily_cycle_limit', 2.0),
-                    bess_enforce_cycle_limit=setup.get('bess_enforce_cycle_limit', False),
-                    dg_enabled=setup.get('dg_enabled', False) and selected_dg > 0,
-                    dg_capacity=selected_dg,
-                    dg_charges_bess=rules.get('dg_charges_bess', False),
-                    dg_load_priority=rules.get('dg_load_priority', 'bess_first'),
-                    dg_takeover_mode=rules.get('dg_takeover_mode', False),
-                    night_start_hour=rules.get('night_start', 18),
-                    night_end_hour=rules.get('night_end', 6),
-                    day_start_hour=rules.get('day_start', 6),
-                    day_end_hour=rules.get('day_end', 18),
-                    blackout_start_hour=rules.get('blackout_start', 0),
-                    blackout_end_hour=rules.get('blackout_end', 0),
-                    dg_soc_on_threshold=rules.get('soc_on_threshold', 30),
-                    dg_soc_off_threshold=rules.get('soc_off_threshold', 80),
-                    dg_fuel_curve_enabled=setup.get('dg_fuel_curve_enabled', False),
-                    dg_fuel_f0=setup.get('dg_fuel_f0', 0.03),
-                    dg_fuel_f1=setup.get('dg_fuel_f1', 0.22),
-                    dg_fuel_flat_rate=setup.get('dg_fuel_flat_rate', 0.25),
-                    cycle_charging_enabled=rules.get('cycle_charging_enabled', False),
-                    cycle_charging_min_load_pct=rules.get('cycle_charging_min_load_pct', 70.0),
-                    cycle_charging_off_soc=rules.get('cycle_charging_off_soc', 80.0),
-                )
-
-                # Run simulation
-                template_id = parse_template_id(rules.get('inferred_template', 'T0'))
-                hourly_results = run_simulation(sim_params, template_id, num_hours=8760)
-
-                # Convert to DataFrame
-                hourly_data = []
-                for i, hr in enumerate(hourly_results):
-                    # Calculate derived values
-                    load_served = hr.solar_to_load + hr.bess_to_load + hr.dg_to_load
-                    bess_charge = hr.solar_to_bess + hr.dg_to_bess
-                    full_delivery = hr.unserved == 0 and hr.load > 0
-                    green_delivery = full_delivery and hr.dg_to_load == 0
-
-                    hourly_data.append({
-                        'Hour': hr.t,
-                        'Day': hr.day,
-                        'Hour_of_Day': hr.hour_of_day,
-                        'Load_MW': hr.load,
-                        'Solar_MW': hr.solar,
-                        'Solar_to_Load_MW': hr.solar_to_load,
-                        'Solar_to_BESS_MW': hr.solar_to_bess,
-                        'Solar_Curtailed_MW': hr.solar_curtailed,
-                        'BESS_to_Load_MW': hr.bess_to_load,
-                        'BESS_Charge_MW': bess_charge,
-                        'BESS_SOC_pct': hr.soc_pct,
-                        'DG_to_Load_MW': hr.dg_to_load,
-                        'DG_to_BESS_MW': hr.dg_to_bess,
-                        'DG_Output_MW': hr.dg_output_mw,
-                        'DG_Fuel_L': hr.dg_fuel_consumed,
-                        'Load_Served_MW': load_served,
-                        'Unserved_MW': hr.unserved,
-                        'Full_Delivery': 'Yes' if full_delivery else 'No',
-                        'Green_Delivery': 'Yes' if green_delivery else 'No',
-                        'DG_Running': 'Yes' if hr.dg_running else 'No',
-                        'Daily_Cycles': hr.daily_cycles,
-                    })
-
-                hourly_df = pd.DataFrame(hourly_data)
-
-                # Store in session state for download
+                # Store in session state for download; the preview slice is
+                # materialized once here rather than re-sliced on every rerun
                 st.session_state['hourly_dispatch_df'] = hourly_df
+                # Yes/No flags become categoricals and the hour indices small ints,
+                # which keeps the preview's Arrow payload off the object-dtype path
+                yes_no = pd.CategoricalDtype(['No', 'Yes'])
+                st.session_state['hourly_dispatch_preview'] = hourly_df.head(48).astype({
+                    'Hour': 'int16',
+                    'Day': 'int16',
+                    'Hour_of_Day': 'int8',
+                    'Full_Delivery': yes_no,
+                    'Green_Delivery': yes_no,
+                    'DG_Running': yes_no,
+                })
                 st.session_state['hourly_dispatch_config'] = {
                     'solar_mwp': selected_solar,
                     'bess_mwh': selected_bess,
@@ -958,10 +1022,13 @@ def main():
 
             # Preview
             with st.expander("Preview Hourly Data (first 48 hours)", expanded=False):
-                st.dataframe(hourly_df.head(48), use_container_width=True, hide_index=True)
+                preview_df = st.session_state.get('hourly_dispatch_preview')
+                if preview_df is None:
+                    preview_df = hourly_df.head(48)
+                st.dataframe(preview_df, use_container_width=True, hide_index=True)
 
             # Download button
-            csv_hourly = hourly_df.to_csv(index=False)
+            csv_hourly = hourly_dispatch_csv(hourly_df)
             filename = (f"hourly_dispatch_Solar{config.get('solar_mwp', 0):.0f}MWp_"
                        f"BESS{config.get('bess_mwh', 0):.0f}MWh_"
                        f"DG{config.get('dg_mw', 0):.0f}MW.csv")
@@ -981,70 +1048,60 @@ def main():
             st.subheader("Monthly Performance Summary")
 
             # Calculate monthly metrics from hourly_df
-            monthly_data = []
             month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
-            # Calculate month using accurate day-based calculation
-            days_in_months = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-            cumulative_hours = []
-            cumsum = 0
-            for days in days_in_months:
-                cumsum += days * 24
-                cumulative_hours.append(cumsum)
-
-            def get_month(hour):
-                for i, cum_hrs in enumerate(cumulative_hours):
-                    if hour <= cum_hrs:
-                        return i + 1
-                return 12
-
-            hourly_df['Month'] = hourly_df['Hour'].apply(get_month)
-
-            for month_num in range(1, 13):
-                # Filter data for this month
-                month_df = hourly_df[hourly_df['Month'] == month_num]
-
-                if len(month_df) == 0:
-                    continue
-
-                # Calculate metrics for this month
-                month_hours = len(month_df)
-                month_load_hours = (month_df['Load_MW'] > 0).sum()
-                month_delivery = (month_df['Full_Delivery'] == 'Yes').sum()
-                month_green = (month_df['Green_Delivery'] == 'Yes').sum()
-                month_dg_hours = (month_df['DG_Running'] == 'Yes').sum()
-                month_solar = month_df['Solar_MW'].sum()
-                month_curtailed = month_df['Solar_Curtailed_MW'].sum()
-                month_unserved = month_df['Unserved_MW'].sum()
-                month_fuel = month_df['DG_Fuel_L'].sum()
-
-                # Solar delivery hours: hours where solar contributed to load during full delivery
-                month_solar_delivery_hrs = ((month_df['Full_Delivery'] == 'Yes') & (month_df['Solar_to_Load_MW'] > 0)).sum()
-                # BESS delivery hours: hours where BESS contributed to load during full delivery
-                month_bess_delivery_hrs = ((month_df['Full_Delivery'] == 'Yes') & (month_df['BESS_to_Load_MW'] > 0)).sum()
-
-                effective_hours = month_load_hours if month_load_hours > 0 else month_hours
-                delivery_pct = (month_delivery / effective_hours * 100) if effective_hours > 0 else 0
-                green_pct = (month_green / month_delivery * 100) if month_delivery > 0 else 0
-                wastage_pct = (month_curtailed / month_solar * 100) if month_solar > 0 else 0
-
-                monthly_data.append({
-                    'Month': month_names[month_num - 1],
-                    'Delivery %': round(delivery_pct, 1),
-                    'Green %': round(max(0, green_pct), 1),
-                    'Wastage %': round(wastage_pct, 1),
-                    'Delivery Hrs': int(month_delivery),
-                    'Load Hrs': int(month_load_hours),
-                    'Green Hrs': int(month_green),
-                    'Solar Hrs': int(month_solar_delivery_hrs),
-                    'BESS Hrs': int(month_bess_delivery_hrs),
-                    'DG Hrs': int(month_dg_hours),
-                    'Curtailed (MWh)': round(month_curtailed, 1),
-                    'Unserved (MWh)': round(month_unserved, 1),
-                    'Fuel (L)': round(month_fuel, 1),
-                })
-
-            monthly_summary_df = pd.DataFrame(monthly_data)
+            # Month of each 1-based Hour from the non-leap-year lookup (hours past year end stay in Dec)
+            month_of_hour = MONTH_OF_HOUR[np.minimum(hourly_df['Hour'].to_numpy(), len(MONTH_OF_HOUR)) - 1]
+
+            # Every monthly total is one bincount over the month index (index 0 unused)
+            def monthly_sum(values):
+                return np.bincount(month_of_hour, weights=values, minlength=13)[1:]
+
+            full_delivery = hourly_df['Full_Delivery'].to_numpy() == 'Yes'
+            month_hours = np.bincount(month_of_hour, minlength=13)[1:]
+            month_load_hours = monthly_sum(hourly_df['Load_MW'].to_numpy() > 0).astype(int)
+            month_delivery = monthly_sum(full_delivery).astype(int)
+            month_green = monthly_sum(hourly_df['Green_Delivery'].to_numpy() == 'Yes').astype(int)
+            month_dg_hours = monthly_sum(hourly_df['DG_Running'].to_numpy() == 'Yes').astype(int)
+            month_solar = monthly_sum(hourly_df['Solar_MW'].to_numpy())
+            month_curtailed = monthly_sum(hourly_df['Solar_Curtailed_MW'].to_numpy())
+            # Solar/BESS delivery hours: full-delivery hours where that source contributed to load
+            month_solar_delivery_hrs = monthly_sum(
+                full_delivery & (hourly_df['Solar_to_Load_MW'].to_numpy() > 0)).astype(int)
+            month_bess_delivery_hrs = monthly_sum(
+                full_delivery & (hourly_df['BESS_to_Load_MW'].to_numpy() > 0)).astype(int)
+
+            effective_hours = np.where(month_load_hours > 0, month_load_hours, month_hours)
+            delivery_pct = np.divide(month_delivery * 100, effective_hours, out=np.zeros(12), where=effective_hours > 0)
+            green_pct = np.divide(month_green * 100, month_delivery, out=np.zeros(12), where=month_delivery > 0)
+            wastage_pct = np.divide(month_curtailed * 100, month_solar, out=np.zeros(12), where=month_solar > 0)
+
+            has_hours = month_hours > 0
+            monthly_data = pd.DataFrame({
+                'Month': month_names,
+                'Delivery %': delivery_pct,
+                'Green %': np.maximum(0, green_pct),
+                'Wastage %': wastage_pct,
+                'Delivery Hrs': month_delivery,
+                'Load Hrs': month_load_hours,
+                'Green Hrs': month_green,
+                'Solar Hrs': month_solar_delivery_hrs,
+                'BESS Hrs': month_bess_delivery_hrs,
+                'DG Hrs': month_dg_hours,
+                'Curtailed (MWh)': month_curtailed,
+                'Unserved (MWh)': monthly_sum(hourly_df['Unserved_MW'].to_numpy()),
+                'Fuel (L)': monthly_sum(hourly_df['DG_Fuel_L'].to_numpy()),
+            })[has_hours].reset_index(drop=True)
+
+            # Round once per column rather than per month
+            monthly_summary_df = monthly_data.round({
+                'Delivery %': 1,
+                'Green %': 1,
+                'Wastage %': 1,
+                'Curtailed (MWh)': 1,
+                'Unserved (MWh)': 1,
+                'Fuel (L)': 1,
+            })
 
             st.dataframe(
                 monthly_summary_df,
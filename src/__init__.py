@@ -5,8 +5,18 @@ This package contains the core simulation engine and data loading utilities
 for Battery Energy Storage System (BESS) sizing and optimization.
 """
 
-from .data_loader import load_solar_profile, get_solar_statistics
-from .dispatch_engine import run_simulation, SimulationParams, calculate_metrics
+import importlib
+
+# Package-level exports are resolved on first access, so importing a light
+# submodule (e.g. src.wizard_state on the Rules page) does not pull in pandas
+# through data_loader and dispatch_engine.
+_LAZY_EXPORTS = {
+    'load_solar_profile': 'data_loader',
+    'get_solar_statistics': 'data_loader',
+    'run_simulation': 'dispatch_engine',
+    'SimulationParams': 'dispatch_engine',
+    'calculate_metrics': 'dispatch_engine',
+}
 
 __all__ = [
     'load_solar_profile',
@@ -17,3 +27,10 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f'.{_LAZY_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
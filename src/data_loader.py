@@ -3,6 +3,7 @@ Data loader module for reading solar profile data
 """
 
 import logging
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -15,6 +16,44 @@ logger = logging.getLogger(__name__)
 INPUTS_FOLDER = Path("Inputs")
 
 
+def _find_solar_column(columns):
+    """Pick the solar generation column: first name mentioning solar/generation/MW, else the second column."""
+    for col in columns:
+        if any(keyword in col.lower() for keyword in ['solar', 'generation', 'mw']):
+            return col
+
+    if len(columns) > 1:
+        return columns[1]
+    return columns[0]
+
+
+@lru_cache(maxsize=8)
+def _read_solar_column_cached(path, mtime_ns):
+    columns = pd.read_csv(path, nrows=0).columns
+    solar_column = _find_solar_column(columns)
+    solar_profile = pd.read_csv(path, usecols=[solar_column])[solar_column].to_numpy()
+    solar_profile.flags.writeable = False
+    return solar_profile
+
+
+def read_solar_column(file_path):
+    """
+    Read only the solar generation column of a profile CSV.
+
+    Parsed once per file version (keyed on path and modification time) and
+    shared between callers, so the returned array is read-only; copy it
+    before modifying in place.
+
+    Args:
+        file_path: Path to the solar profile CSV
+
+    Returns:
+        numpy array: Solar generation values in file order
+    """
+    path = Path(file_path)
+    return _read_solar_column_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+
 def list_solar_profiles():
     """
     List all available solar profile CSV files in the Inputs folder.
@@ -69,22 +108,7 @@ def load_solar_profile_by_name(filename):
         return None
 
     try:
-        df = pd.read_csv(file_path)
-
-        # Extract solar generation column
-        solar_column = None
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['solar', 'generation', 'mw']):
-                solar_column = col
-                break
-
-        if solar_column is None:
-            if len(df.columns) > 1:
-                solar_column = df.columns[1]
-            else:
-                solar_column = df.columns[0]
-
-        solar_profile = df[solar_column].values
+        solar_profile = read_solar_column(file_path)
 
         if len(solar_profile) != 8760:
             try:
@@ -133,22 +157,7 @@ def load_solar_profile(file_path=None):
     file_path = SOLAR_PROFILE_PATH
 
     try:
-        df = pd.read_csv(file_path)
-
-        # Extract solar generation column
-        solar_column = None
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['solar', 'generation', 'mw']):
-                solar_column = col
-                break
-
-        if solar_column is None:
-            if len(df.columns) > 1:
-                solar_column = df.columns[1]
-            else:
-                solar_column = df.columns[0]
-
-        solar_profile = df[solar_column].values
+        solar_profile = read_solar_column(file_path)
 
         if len(solar_profile) != 8760:
             try:
@@ -243,4 +252,30 @@ def get_base_solar_peak_capacity(profile):
         return 0.0
     if hasattr(profile, '__len__') and len(profile) == 0:
         return 0.0
-    return float(max(profile))
\ No newline at end of file
+    return float(max(profile))
+
+def read_only_frame(df):
+    """
+    Copy a DataFrame into one whose NumPy-backed columns are read-only.
+
+    For frames shared between sessions (e.g. held with st.cache_resource):
+    any in-place write, including one made through a shallow copy such as
+    ``.loc`` assignment or ``+=`` on a column, raises an error instead of
+    changing the shared data. Adding or replacing whole columns on a
+    copy still works.
+
+    Args:
+        df: DataFrame to copy
+
+    Returns:
+        pd.DataFrame: Frame with the same columns, index and dtypes
+    """
+    columns = {}
+    for name, column in df.items():
+        values = column.array
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+        columns[name] = values
+    # copy=False keeps each array as its own block rather than consolidating
+    return pd.DataFrame(columns, index=df.index, copy=False)
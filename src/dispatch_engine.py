@@ -9,8 +9,14 @@ Existing pages continue to use battery_simulator.py.
 """
 
 import math
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 # Import fuel model for DG fuel consumption calculations
 from src.fuel_model import calculate_fuel_rate, calculate_fuel_consumption
@@ -82,7 +88,7 @@ class SimulationParams:
     cycle_charging_off_soc: float = 80.0  # Stop cycle charging at this SOC %
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationState:
     """Mutable state during simulation."""
     # Configuration
@@ -122,7 +128,7 @@ class SimulationState:
     total_dg_fuel_consumed: float = 0  # Liters
 
 
-@dataclass
+@dataclass(slots=True)
 class HourlyResult:
     """Results for a single hour."""
     t: int = 0
@@ -218,46 +224,29 @@ class SummaryMetrics:
 # INITIALIZATION FUNCTIONS
 # =============================================================================
 
-def build_hour_arrays(params: SimulationParams) -> Tuple[List[bool], List[bool], List[bool]]:
-    """Build boolean arrays for night, day, and blackout hours."""
-    is_night = [False] * 24
-    is_day = [False] * 24
-    is_blackout = [False] * 24
+_HOURS_OF_DAY = np.arange(24)
 
-    # Night hours (spans midnight typically)
-    start, end = params.night_start_hour, params.night_end_hour
-    if start > end:
-        for h in range(start, 24):
-            is_night[h] = True
-        for h in range(0, end):
-            is_night[h] = True
-    elif start < end:
-        for h in range(start, end):
-            is_night[h] = True
-
-    # Day hours
-    start, end = params.day_start_hour, params.day_end_hour
-    if start < end:
-        for h in range(start, end):
-            is_day[h] = True
-    elif start > end:
-        for h in range(start, 24):
-            is_day[h] = True
-        for h in range(0, end):
-            is_day[h] = True
-
-    # Blackout hours
-    start, end = params.blackout_start_hour, params.blackout_end_hour
+
+def _hour_window_mask(start: int, end: int) -> np.ndarray:
+    """Boolean mask over hours 0-23 for the window [start, end), wrapping past midnight."""
     if start > end:
-        for h in range(start, 24):
-            is_blackout[h] = True
-        for h in range(0, end):
-            is_blackout[h] = True
-    elif start < end:
-        for h in range(start, end):
-            is_blackout[h] = True
+        return (_HOURS_OF_DAY >= start) | (_HOURS_OF_DAY < end)
+    return (_HOURS_OF_DAY >= start) & (_HOURS_OF_DAY < end)
+
 
-    return is_night, is_day, is_blackout
+def build_hour_arrays(params: SimulationParams) -> Tuple[List[bool], List[bool], List[bool]]:
+    """Build boolean arrays for night, day, and blackout hours.
+
+    Each window is one vectorized comparison over the 24 hours; a window
+    with start == end is empty. Returned as lists because the dispatch loop
+    indexes them per hour, where plain Python bools are cheaper than NumPy
+    scalars.
+    """
+    is_night = _hour_window_mask(params.night_start_hour, params.night_end_hour)
+    is_day = _hour_window_mask(params.day_start_hour, params.day_end_hour)
+    is_blackout = _hour_window_mask(params.blackout_start_hour, params.blackout_end_hour)
+
+    return is_night.tolist(), is_day.tolist(), is_blackout.tolist()
 
 
 def initialize_simulation(params: SimulationParams) -> SimulationState:
@@ -308,26 +297,18 @@ def initialize_simulation(params: SimulationParams) -> SimulationState:
 def charge_bess(state: SimulationState, energy_available: float,
                 charge_power_used: float) -> Tuple[float, float]:
     """Attempt to charge BESS. Returns (energy_charged, new_charge_power_used)."""
-    if energy_available <= 0 or state.bess_disabled_today:
-        return 0, charge_power_used
-
-    charge_room = state.max_soc_mwh - state.soc
-    charge_power_available = state.charge_power_limit - charge_power_used
-
-    if charge_power_available <= 0 or charge_room <= 0:
-        return 0, charge_power_used
-
+    # A non-positive input, power headroom or SoC room all clamp the min to <= 0,
+    # so one check after the clamp replaces the separate early-outs.
     max_charge = min(
         energy_available,
-        charge_power_available,
-        charge_room / state.charge_efficiency
+        state.charge_power_limit - charge_power_used,
+        (state.max_soc_mwh - state.soc) / state.charge_efficiency
     )
 
-    if max_charge <= 0:
+    if max_charge <= 0 or state.bess_disabled_today:
         return 0, charge_power_used
 
-    energy_stored = max_charge * state.charge_efficiency
-    state.soc += energy_stored
+    state.soc += max_charge * state.charge_efficiency
 
     return max_charge, charge_power_used + max_charge
 
@@ -335,24 +316,16 @@ def charge_bess(state: SimulationState, energy_available: float,
 def discharge_bess(state: SimulationState, params: SimulationParams,
                    energy_needed: float) -> Tuple[float, bool]:
     """Attempt to discharge BESS. Returns (energy_discharged, discharged_flag)."""
-    if energy_needed <= 0 or state.bess_disabled_today:
-        return 0, False
-
-    discharge_available = state.soc - state.min_soc_mwh
-    if discharge_available <= 0:
-        return 0, False
-
     max_discharge = min(
         energy_needed,
         state.discharge_power_limit,
-        discharge_available * state.discharge_efficiency
+        (state.soc - state.min_soc_mwh) * state.discharge_efficiency
     )
 
-    if max_discharge <= 0:
+    if max_discharge <= 0 or state.bess_disabled_today:
         return 0, False
 
-    energy_withdrawn = max_discharge / state.discharge_efficiency
-    state.soc -= energy_withdrawn
+    state.soc -= max_discharge / state.discharge_efficiency
 
     # Update cycle tracking
     state.daily_discharge += max_discharge
@@ -1053,6 +1026,25 @@ DISPATCH_FUNCTIONS = {
 }
 
 
+def _split_solar_to_load(load_profile, solar_profile,
+                         num_hours: int) -> Tuple[List[float], List[float], List[float], List[float]]:
+    """Tile profiles to num_hours and split solar into direct-to-load and excess.
+
+    Profiles shorter than num_hours repeat cyclically; empty profiles are zero.
+    Returns plain float lists (load, solar, solar_to_load, excess_solar) so the
+    hourly loop works on Python floats rather than NumPy scalars.
+    """
+    load = np.resize(np.asarray(load_profile, dtype=float), num_hours) if len(load_profile) > 0 \
+        else np.zeros(num_hours)
+    solar = np.resize(np.asarray(solar_profile, dtype=float), num_hours) if len(solar_profile) > 0 \
+        else np.zeros(num_hours)
+
+    solar_to_load = np.minimum(solar, load)
+    excess_solar = solar - solar_to_load
+
+    return load.tolist(), solar.tolist(), solar_to_load.tolist(), excess_solar.tolist()
+
+
 def run_simulation(params: SimulationParams, template_id: int,
                    num_hours: int = 8760) -> List[HourlyResult]:
     """
@@ -1070,8 +1062,16 @@ def run_simulation(params: SimulationParams, template_id: int,
     dispatch_func = DISPATCH_FUNCTIONS.get(template_id, dispatch_template_0)
     results = []
 
-    load_len = len(params.load_profile)
-    solar_len = len(params.solar_profile)
+    # Solar-to-load split does not depend on SoC, so compute it for all hours
+    # up front; only the template dispatch below is path-dependent.
+    load_arr, solar_arr, solar_to_load_arr, excess_solar_arr = _split_solar_to_load(
+        params.load_profile, params.solar_profile, num_hours)
+
+    # Loop-invariant lookups, bound once instead of per hour
+    min_soc_mwh = state.min_soc_mwh
+    max_soc_mwh = state.max_soc_mwh
+    soc_pct_factor = 100 / state.bess_capacity if state.bess_capacity > 0 else 0
+    tolerance = FLOATING_POINT_TOLERANCE
 
     for t in range(num_hours):
         # Daily reset
@@ -1088,29 +1088,27 @@ def run_simulation(params: SimulationParams, template_id: int,
         hour.day = day_of_year
         hour.hour_of_day = t % 24
 
-        hour.load = params.load_profile[t % load_len] if load_len > 0 else 0
-        hour.solar = params.solar_profile[t % solar_len] if solar_len > 0 else 0
-
-        remaining_load = hour.load
+        hour.load = load_arr[t]
+        hour.solar = solar_arr[t]
 
         # Solar direct to load
-        hour.solar_to_load = min(hour.solar, remaining_load)
-        remaining_load -= hour.solar_to_load
-        excess_solar = hour.solar - hour.solar_to_load
+        hour.solar_to_load = solar_to_load_arr[t]
+        remaining_load = hour.load - hour.solar_to_load
+        excess_solar = excess_solar_arr[t]
 
         # Template dispatch
         remaining_load, bess_discharged, charge_power_used = dispatch_func(
             params, state, hour, remaining_load, excess_solar)
 
         # Unserved
-        hour.unserved = remaining_load if remaining_load > FLOATING_POINT_TOLERANCE else 0
+        hour.unserved = remaining_load if remaining_load > tolerance else 0
 
         # SoC clamping
-        state.soc = max(state.min_soc_mwh, min(state.soc, state.max_soc_mwh))
+        state.soc = max(min_soc_mwh, min(state.soc, max_soc_mwh))
 
         # Record results
         hour.soc = state.soc
-        hour.soc_pct = (state.soc / state.bess_capacity * 100) if state.bess_capacity > 0 else 0
+        hour.soc_pct = state.soc * soc_pct_factor
         hour.daily_cycles = state.daily_cycles
         hour.bess_disabled = state.bess_disabled_today
 
@@ -1135,24 +1133,40 @@ def calculate_metrics(results: List[HourlyResult], params: SimulationParams) ->
     """Calculate summary metrics from simulation results."""
     metrics = SummaryMetrics()
 
-    metrics.total_load = sum(r.load for r in results)
-    metrics.total_solar_generation = sum(r.solar for r in results)
-    metrics.total_solar_to_load = sum(r.solar_to_load for r in results)
-    metrics.total_solar_to_bess = sum(r.solar_to_bess for r in results)
-    metrics.total_solar_curtailed = sum(r.solar_curtailed for r in results)
-    metrics.total_bess_to_load = sum(r.bess_to_load for r in results)
-    metrics.total_dg_to_load = sum(r.dg_to_load for r in results)
-    metrics.total_dg_to_bess = sum(r.dg_to_bess for r in results)
-    metrics.total_dg_curtailed = sum(r.dg_curtailed for r in results)
-    metrics.total_unserved = sum(r.unserved for r in results)
+    # Pull each field into an array once; every total below is an array reduction
+    n = len(results)
+
+    def column(name, dtype=np.float64):
+        return np.fromiter(map(attrgetter(name), results), dtype=dtype, count=n)
+
+    load = column('load')
+    solar = column('solar')
+    solar_curtailed = column('solar_curtailed')
+    unserved = column('unserved')
+    day = column('day', np.int64)
+    dg_running = column('dg_running', bool)
+
+    metrics.total_load = float(load.sum())
+    metrics.total_solar_generation = float(solar.sum())
+    metrics.total_solar_to_load = float(column('solar_to_load').sum())
+    metrics.total_solar_to_bess = float(column('solar_to_bess').sum())
+    metrics.total_solar_curtailed = float(solar_curtailed.sum())
+    metrics.total_bess_to_load = float(column('bess_to_load').sum())
+    metrics.total_dg_to_load = float(column('dg_to_load').sum())
+    metrics.total_dg_to_bess = float(column('dg_to_bess').sum())
+    metrics.total_dg_curtailed = float(column('dg_curtailed').sum())
+    metrics.total_unserved = float(unserved.sum())
 
     # Count hours with actual load demand (important for seasonal patterns)
-    metrics.hours_with_load = sum(1 for r in results if r.load > 0)
+    has_load = load > 0
+    metrics.hours_with_load = int(np.count_nonzero(has_load))
 
     # Delivery hours: only count hours where there was load AND it was fully served
-    metrics.hours_full_delivery = sum(1 for r in results if r.load > 0 and r.unserved < FLOATING_POINT_TOLERANCE)
-    metrics.hours_green_delivery = sum(1 for r in results if r.load > 0 and r.unserved < FLOATING_POINT_TOLERANCE and not r.dg_running)
-    metrics.hours_with_dg = sum(1 for r in results if r.dg_running)
+    full_delivery = has_load & (unserved < FLOATING_POINT_TOLERANCE)
+    green_delivery = full_delivery & ~dg_running
+    metrics.hours_full_delivery = int(np.count_nonzero(full_delivery))
+    metrics.hours_green_delivery = int(np.count_nonzero(green_delivery))
+    metrics.hours_with_dg = int(np.count_nonzero(dg_running))
 
     # Calculate percentages against hours with load (not total hours)
     if metrics.hours_with_load > 0:
@@ -1166,19 +1180,9 @@ def calculate_metrics(results: List[HourlyResult], params: SimulationParams) ->
     MAR_START_DAY = 60
     OCT_END_DAY = 304
 
-    metrics.hours_full_delivery_mar_oct = sum(
-        1 for r in results
-        if MAR_START_DAY <= r.day <= OCT_END_DAY
-        and r.load > 0
-        and r.unserved < FLOATING_POINT_TOLERANCE
-    )
-    metrics.hours_green_delivery_mar_oct = sum(
-        1 for r in results
-        if MAR_START_DAY <= r.day <= OCT_END_DAY
-        and r.load > 0
-        and r.unserved < FLOATING_POINT_TOLERANCE
-        and not r.dg_running
-    )
+    mar_oct = (day >= MAR_START_DAY) & (day <= OCT_END_DAY)
+    metrics.hours_full_delivery_mar_oct = int(np.count_nonzero(full_delivery & mar_oct))
+    metrics.hours_green_delivery_mar_oct = int(np.count_nonzero(green_delivery & mar_oct))
 
     if metrics.hours_full_delivery_mar_oct > 0:
         metrics.pct_green_delivery_mar_oct = (
@@ -1192,16 +1196,16 @@ def calculate_metrics(results: List[HourlyResult], params: SimulationParams) ->
         metrics.pct_solar_curtailed = metrics.total_solar_curtailed / metrics.total_solar_generation * 100
 
     # Calculate wastage during load hours only (for seasonal loads)
-    metrics.solar_during_load_hours = sum(r.solar for r in results if r.load > 0)
-    metrics.solar_curtailed_during_load_hours = sum(r.solar_curtailed for r in results if r.load > 0)
+    metrics.solar_during_load_hours = float(solar[has_load].sum())
+    metrics.solar_curtailed_during_load_hours = float(solar_curtailed[has_load].sum())
     if metrics.solar_during_load_hours > 0:
         metrics.pct_solar_curtailed_load_hours = (
             metrics.solar_curtailed_during_load_hours / metrics.solar_during_load_hours * 100
         )
 
     metrics.dg_runtime_hours = metrics.hours_with_dg
-    metrics.dg_starts = sum(1 for i, r in enumerate(results)
-                           if r.dg_running and (i == 0 or not results[i-1].dg_running))
+    # A start is a running hour whose previous hour was off (or the first hour)
+    metrics.dg_starts = int(np.count_nonzero(dg_running[1:] & ~dg_running[:-1])) + int(n > 0 and dg_running[0])
 
     metrics.bess_throughput = metrics.total_bess_to_load
     usable = params.bess_capacity * (params.bess_max_soc - params.bess_min_soc) / 100
@@ -1209,8 +1213,8 @@ def calculate_metrics(results: List[HourlyResult], params: SimulationParams) ->
         metrics.bess_equivalent_cycles = metrics.bess_throughput / usable
 
     # Fuel consumption metrics
-    metrics.total_fuel_consumed = sum(r.dg_fuel_consumed for r in results)
-    metrics.cycle_charging_hours = sum(1 for r in results if r.cycle_charging)
+    metrics.total_fuel_consumed = float(column('dg_fuel_consumed').sum())
+    metrics.cycle_charging_hours = int(np.count_nonzero(column('cycle_charging', bool)))
 
     if metrics.dg_runtime_hours > 0:
         metrics.avg_fuel_rate_lph = metrics.total_fuel_consumed / metrics.dg_runtime_hours
@@ -1239,3 +1243,103 @@ def calculate_metrics(results: List[HourlyResult], params: SimulationParams) ->
         metrics.pct_green_energy = 0.0
 
     return metrics
+
+
+# =============================================================================
+# BATCH SIMULATION
+# =============================================================================
+
+def simulate_metrics(params: SimulationParams, template_id: int,
+                     num_hours: int = 8760) -> SummaryMetrics:
+    """Run one simulation and return only its summary metrics."""
+    return calculate_metrics(run_simulation(params, template_id, num_hours), params)
+
+
+# Load/solar profiles shared by a batch, installed once per worker process
+_batch_profiles: List[List[float]] = []
+
+
+def _init_batch_worker(profiles: List[List[float]]) -> None:
+    """Process-pool initializer: receive the batch's distinct profiles once."""
+    global _batch_profiles
+    _batch_profiles = profiles
+
+
+def _simulate_metrics_task(task: Tuple[SimulationParams, int, int, int, int]) -> SummaryMetrics:
+    """Process-pool entry point (must be module-level to be picklable).
+
+    Tasks carry indices into the worker's shared profiles instead of the
+    8760-hour lists themselves, so each task pickles only the scalar settings.
+    """
+    params, load_idx, solar_idx, template_id, num_hours = task
+    params = replace(params, load_profile=_batch_profiles[load_idx],
+                     solar_profile=_batch_profiles[solar_idx])
+    return simulate_metrics(params, template_id, num_hours)
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on (honours affinity/cgroup cpusets, unlike os.cpu_count)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _pool_context():
+    """Start workers without fork(): the Streamlit server is multithreaded."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def iter_batch_metrics(params_list: Sequence[SimulationParams], template_id: int,
+                       num_hours: int = 8760,
+                       max_workers: Optional[int] = None) -> Iterator[SummaryMetrics]:
+    """
+    Simulate independent configurations, yielding metrics in input order.
+
+    Configurations are fanned out over a process pool when this process may
+    use more than one CPU (counted from its affinity mask, so container CPU
+    limits are respected); single-CPU hosts and single-config batches run
+    sequentially in-process. Workers are started with forkserver (or spawn)
+    rather than fork, which is unsafe from the multithreaded Streamlit server.
+
+    Args:
+        params_list: Simulation parameters, one per configuration
+        template_id: Template (0-6) shared by all configurations
+        num_hours: Hours to simulate per configuration
+        max_workers: Optional cap on worker processes (default: usable CPUs)
+
+    Yields:
+        SummaryMetrics for each configuration, in the order given
+    """
+    total = len(params_list)
+    workers = min(total, max_workers or _available_cpus())
+
+    if workers <= 1:
+        for params in params_list:
+            yield simulate_metrics(params, template_id, num_hours)
+        return
+
+    # Sweeps reuse a handful of profile lists across many configurations;
+    # ship each distinct list to the workers once rather than with every task
+    profiles = []
+    profile_index = {}
+
+    def profile_slot(profile) -> int:
+        key = id(profile)
+        if key not in profile_index:
+            profile_index[key] = len(profiles)
+            profiles.append(profile)
+        return profile_index[key]
+
+    tasks = [
+        (replace(params, load_profile=[], solar_profile=[]),
+         profile_slot(params.load_profile), profile_slot(params.solar_profile),
+         template_id, num_hours)
+        for params in params_list
+    ]
+    chunksize = max(1, total // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                             initializer=_init_batch_worker, initargs=(profiles,)) as pool:
+        yield from pool.map(_simulate_metrics_task, tasks, chunksize=chunksize)
@@ -9,7 +9,7 @@ from dataclasses import dataclass, asdict, field
 from typing import List, Dict, Optional, Callable
 import pandas as pd
 
-from src.dispatch_engine import SimulationParams, run_simulation, calculate_metrics
+from src.dispatch_engine import SimulationParams, iter_batch_metrics
 from src.data_loader import scale_solar_profile, get_base_solar_peak_capacity
 
 
@@ -186,9 +186,43 @@ def run_green_energy_optimization(
 
     # Total simulations (4D)
     total_sims = len(solar_capacities) * len(bess_capacities) * len(container_types) * len(dg_capacities)
-    current_sim = 0
+    template_id = parse_template_id(opt_params.dispatch_template)
+
+    # Wizard settings are identical for every configuration, so resolve them once
+    shared_params = {
+        'bess_efficiency': bess_config.get('bess_efficiency', 87),
+        'bess_min_soc': bess_config.get('bess_min_soc', 5),
+        'bess_max_soc': bess_config.get('bess_max_soc', 95),
+        'bess_initial_soc': bess_config.get('bess_initial_soc', 50),
+        'bess_daily_cycle_limit': bess_config.get('bess_daily_cycle_limit', 2.0),
+        'bess_enforce_cycle_limit': bess_config.get('bess_enforce_cycle_limit', False),
+        'dg_charges_bess': dispatch_rules.get('dg_charges_bess', False),
+        'dg_load_priority': dispatch_rules.get('dg_load_priority', 'bess_first'),
+        'dg_takeover_mode': dispatch_rules.get('dg_takeover_mode', False),
+        'night_start_hour': dispatch_rules.get('night_start', 18),
+        'night_end_hour': dispatch_rules.get('night_end', 6),
+        'day_start_hour': dispatch_rules.get('day_start', 6),
+        'day_end_hour': dispatch_rules.get('day_end', 18),
+        'blackout_start_hour': dispatch_rules.get('blackout_start', 0),
+        'blackout_end_hour': dispatch_rules.get('blackout_end', 0),
+        'dg_soc_on_threshold': dispatch_rules.get('soc_on_threshold', 30),
+        'dg_soc_off_threshold': dispatch_rules.get('soc_off_threshold', 80),
+        'dg_fuel_curve_enabled': dg_config.get('dg_fuel_curve_enabled', False),
+        'dg_fuel_f0': dg_config.get('dg_fuel_f0', 0.03),
+        'dg_fuel_f1': dg_config.get('dg_fuel_f1', 0.22),
+        'dg_fuel_flat_rate': dg_config.get('dg_fuel_flat_rate', 0.25),
+        'cycle_charging_enabled': dispatch_rules.get('cycle_charging_enabled', False),
+        'cycle_charging_min_load_pct': dispatch_rules.get('cycle_charging_min_load_pct', 70.0),
+        'cycle_charging_off_soc': dispatch_rules.get('cycle_charging_off_soc', 80.0),
+    }
 
-    all_results = []
+    # Build every configuration up front so the simulations can run as a batch.
+    # Configurations whose simulation inputs coincide (e.g. BESS=0 under every
+    # container type, where duration has no effect) share one simulation.
+    configs = []
+    config_slots = []
+    params_list = []
+    param_slots = {}
 
     # 4D Sweep: Solar × BESS × Container × DG
     for solar_mw in solar_capacities:
@@ -199,8 +233,6 @@ def run_green_energy_optimization(
             solar_mw
         )
 
-        solar_results = []
-
         for bess_mwh in bess_capacities:
             for container_type in container_types:
                 spec = CONTAINER_SPECS.get(container_type, CONTAINER_SPECS['5mwh_2.5mw'])
@@ -209,104 +241,93 @@ def run_green_energy_optimization(
                 containers = int(bess_mwh / spec['energy_mwh']) if bess_mwh > 0 else 0
 
                 for dg_mw in dg_capacities:
-                    current_sim += 1
+                    configs.append((solar_mw, bess_mwh, duration_hr, power_mw, containers, dg_mw))
 
-                    if progress_callback:
-                        progress_callback(
-                            current_sim,
-                            total_sims,
-                            f"Solar={solar_mw}MW, BESS={bess_mwh}MWh ({duration_hr}hr), DG={dg_mw}MW"
-                        )
+                    slot = param_slots.setdefault((solar_mw, bess_mwh, power_mw, dg_mw), len(params_list))
+                    config_slots.append(slot)
+                    if slot < len(params_list):
+                        continue
 
                     # Build simulation parameters
-                    sim_params = SimulationParams(
+                    params_list.append(SimulationParams(
                         load_profile=load_profile,
                         solar_profile=scaled_solar,
                         bess_capacity=bess_mwh,
                         bess_charge_power=power_mw,
                         bess_discharge_power=power_mw,
-                        bess_efficiency=bess_config.get('bess_efficiency', 87),
-                        bess_min_soc=bess_config.get('bess_min_soc', 5),
-                        bess_max_soc=bess_config.get('bess_max_soc', 95),
-                        bess_initial_soc=bess_config.get('bess_initial_soc', 50),
-                        bess_daily_cycle_limit=bess_config.get('bess_daily_cycle_limit', 2.0),
-                        bess_enforce_cycle_limit=bess_config.get('bess_enforce_cycle_limit', False),
                         dg_enabled=opt_params.dg_enabled and dg_mw > 0,
                         dg_capacity=dg_mw,
-                        dg_charges_bess=dispatch_rules.get('dg_charges_bess', False),
-                        dg_load_priority=dispatch_rules.get('dg_load_priority', 'bess_first'),
-                        dg_takeover_mode=dispatch_rules.get('dg_takeover_mode', False),
-                        night_start_hour=dispatch_rules.get('night_start', 18),
-                        night_end_hour=dispatch_rules.get('night_end', 6),
-                        day_start_hour=dispatch_rules.get('day_start', 6),
-                        day_end_hour=dispatch_rules.get('day_end', 18),
-                        blackout_start_hour=dispatch_rules.get('blackout_start', 0),
-                        blackout_end_hour=dispatch_rules.get('blackout_end', 0),
-                        dg_soc_on_threshold=dispatch_rules.get('soc_on_threshold', 30),
-                        dg_soc_off_threshold=dispatch_rules.get('soc_off_threshold', 80),
-                        dg_fuel_curve_enabled=dg_config.get('dg_fuel_curve_enabled', False),
-                        dg_fuel_f0=dg_config.get('dg_fuel_f0', 0.03),
-                        dg_fuel_f1=dg_config.get('dg_fuel_f1', 0.22),
-                        dg_fuel_flat_rate=dg_config.get('dg_fuel_flat_rate', 0.25),
-                        cycle_charging_enabled=dispatch_rules.get('cycle_charging_enabled', False),
-                        cycle_charging_min_load_pct=dispatch_rules.get('cycle_charging_min_load_pct', 70.0),
-                        cycle_charging_off_soc=dispatch_rules.get('cycle_charging_off_soc', 80.0),
-                    )
-
-                    # Run simulation
-                    template_id = parse_template_id(opt_params.dispatch_template)
-                    hourly_results = run_simulation(sim_params, template_id, num_hours=8760)
-                    metrics = calculate_metrics(hourly_results, sim_params)
-
-                    # Check constraints
-                    meets_green_target = metrics.pct_green_energy >= opt_params.green_energy_target_pct
-
-                    if opt_params.max_wastage_pct is not None:
-                        meets_wastage_limit = metrics.pct_solar_curtailed <= opt_params.max_wastage_pct
-                    else:
-                        meets_wastage_limit = True
-
-                    is_viable = meets_green_target and meets_wastage_limit
-
-                    # Create result with all metrics
-                    # Note: All metrics fields are guaranteed to exist in SummaryMetrics dataclass
-                    result = GreenEnergyResult(
-                        # Configuration
-                        solar_capacity_mw=solar_mw,
-                        bess_capacity_mwh=bess_mwh,
-                        duration_hr=duration_hr,
-                        power_mw=power_mw,
-                        containers=containers,
-                        dg_capacity_mw=dg_mw,
-                        # Delivery metrics
-                        delivery_pct=metrics.pct_full_delivery,
-                        green_energy_pct=metrics.pct_green_energy,
-                        green_hours_pct=metrics.pct_green_delivery,
-                        green_hours_pct_mar_oct=metrics.pct_green_delivery_mar_oct,
-                        wastage_pct=metrics.pct_solar_curtailed,
-                        # Hour counts
-                        delivery_hours=metrics.hours_full_delivery,
-                        load_hours=metrics.hours_with_load,
-                        green_hours=metrics.hours_green_delivery,
-                        dg_runtime_hours=metrics.dg_runtime_hours,
-                        dg_starts=metrics.dg_starts,
-                        # Other metrics
-                        total_cycles=metrics.bess_equivalent_cycles,
-                        unserved_mwh=metrics.total_unserved,
-                        fuel_liters=metrics.total_fuel_consumed,
-                        # Energy totals
-                        total_solar_generated_gwh=metrics.total_solar_generation / 1000,
-                        total_solar_curtailed_gwh=metrics.total_solar_curtailed / 1000,
-                        total_green_delivered_gwh=metrics.total_green_energy_delivered / 1000,
-                        total_energy_delivered_gwh=metrics.total_energy_delivered / 1000,
-                        # Viability
-                        meets_green_target=meets_green_target,
-                        meets_wastage_limit=meets_wastage_limit,
-                        is_viable=is_viable
-                    )
-
-                    all_results.append(result)
-                    solar_results.append(result)
+                        **shared_params,
+                    ))
+
+    all_results = []
+
+    # Run simulations (in parallel where CPUs allow); metrics arrive in params_list order,
+    # which is the order each slot is first needed while walking the configurations
+    batch_metrics = iter_batch_metrics(params_list, template_id, num_hours=8760)
+    slot_metrics = []
+
+    for current_sim, (config, slot) in enumerate(zip(configs, config_slots), start=1):
+        solar_mw, bess_mwh, duration_hr, power_mw, containers, dg_mw = config
+        if slot == len(slot_metrics):
+            slot_metrics.append(next(batch_metrics))
+        metrics = slot_metrics[slot]
+
+        if progress_callback:
+            progress_callback(
+                current_sim,
+                total_sims,
+                f"Solar={solar_mw}MW, BESS={bess_mwh}MWh ({duration_hr}hr), DG={dg_mw}MW"
+            )
+
+        # Check constraints
+        meets_green_target = metrics.pct_green_energy >= opt_params.green_energy_target_pct
+
+        if opt_params.max_wastage_pct is not None:
+            meets_wastage_limit = metrics.pct_solar_curtailed <= opt_params.max_wastage_pct
+        else:
+            meets_wastage_limit = True
+
+        is_viable = meets_green_target and meets_wastage_limit
+
+        # Create result with all metrics
+        # Note: All metrics fields are guaranteed to exist in SummaryMetrics dataclass
+        result = GreenEnergyResult(
+            # Configuration
+            solar_capacity_mw=solar_mw,
+            bess_capacity_mwh=bess_mwh,
+            duration_hr=duration_hr,
+            power_mw=power_mw,
+            containers=containers,
+            dg_capacity_mw=dg_mw,
+            # Delivery metrics
+            delivery_pct=metrics.pct_full_delivery,
+            green_energy_pct=metrics.pct_green_energy,
+            green_hours_pct=metrics.pct_green_delivery,
+            green_hours_pct_mar_oct=metrics.pct_green_delivery_mar_oct,
+            wastage_pct=metrics.pct_solar_curtailed,
+            # Hour counts
+            delivery_hours=metrics.hours_full_delivery,
+            load_hours=metrics.hours_with_load,
+            green_hours=metrics.hours_green_delivery,
+            dg_runtime_hours=metrics.dg_runtime_hours,
+            dg_starts=metrics.dg_starts,
+            # Other metrics
+            total_cycles=metrics.bess_equivalent_cycles,
+            unserved_mwh=metrics.total_unserved,
+            fuel_liters=metrics.total_fuel_consumed,
+            # Energy totals
+            total_solar_generated_gwh=metrics.total_solar_generation / 1000,
+            total_solar_curtailed_gwh=metrics.total_solar_curtailed / 1000,
+            total_green_delivered_gwh=metrics.total_green_energy_delivered / 1000,
+            total_energy_delivered_gwh=metrics.total_energy_delivered / 1000,
+            # Viability
+            meets_green_target=meets_green_target,
+            meets_wastage_limit=meets_wastage_limit,
+            is_viable=is_viable
+        )
+
+        all_results.append(result)
 
     # Filter viable configurations
     viable_configs = [r for r in all_results if r.is_viable]
@@ -6,6 +6,7 @@ Supports constant, day-only, night-only, seasonal, custom windows, and CSV uploa
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 import pandas as pd
 
@@ -25,6 +26,15 @@ MONTH_DAY_END = {
     7: 212, 8: 243, 9: 273, 10: 304, 11: 334, 12: 365
 }
 
+# Month (1-12) of each day and each hour of a non-leap year, indexed from 0
+MONTH_OF_DAY = np.repeat(
+    np.arange(1, 13, dtype=np.int8),
+    [MONTH_DAY_END[m] - MONTH_DAY_START[m] + 1 for m in range(1, 13)]
+)
+MONTH_OF_HOUR = np.repeat(MONTH_OF_DAY, 24)
+MONTH_OF_DAY.flags.writeable = False
+MONTH_OF_HOUR.flags.writeable = False
+
 MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
@@ -88,20 +98,16 @@ def build_load_profile(
         start = params.get('start', 6)
         end = params.get('end', 18)
 
-        for hour in range(num_hours):
-            hour_of_day = hour % 24
-            if _is_in_range(hour_of_day, start, end):
-                load[hour] = mw
+        hour_of_day, _ = _hour_indices(num_hours)
+        load[_hour_range_mask(hour_of_day, start, end)] = mw
 
     elif mode == 'night_only':
         mw = params.get('mw', 25.0)
         start = params.get('start', 18)
         end = params.get('end', 6)
 
-        for hour in range(num_hours):
-            hour_of_day = hour % 24
-            if _is_in_range(hour_of_day, start, end):
-                load[hour] = mw
+        hour_of_day, _ = _hour_indices(num_hours)
+        load[_hour_range_mask(hour_of_day, start, end)] = mw
 
     elif mode == 'seasonal':
         mw = params.get('mw', 25.0)
@@ -113,26 +119,21 @@ def build_load_profile(
         # Normalize midnight: 0 means end of day (24:00)
         effective_day_end = 24 if day_end == 0 else day_end
 
-        for hour in range(num_hours):
-            day_of_year = (hour // 24) + 1  # 1-365
-            hour_of_day = hour % 24         # 0-23
-
-            # Check if in active month range AND active time window
-            if _is_in_month_range(day_of_year, start_month, end_month):
-                if _is_in_range(hour_of_day, day_start, effective_day_end):
-                    load[hour] = mw
+        hour_of_day, day_of_year = _hour_indices(num_hours)
+        # Active month range AND active time window
+        active = (_month_range_mask(day_of_year, start_month, end_month)
+                  & _hour_range_mask(hour_of_day, day_start, effective_day_end))
+        load[active] = mw
 
     elif mode == 'custom':
         windows = params.get('windows', [])
+        hour_of_day, _ = _hour_indices(num_hours)
+        # Later windows overwrite earlier ones where they overlap
         for window in windows:
             start = window.get('start', 0)
             end = window.get('end', 24)
             mw = window.get('mw', 0)
-
-            for hour in range(num_hours):
-                hour_of_day = hour % 24
-                if _is_in_range(hour_of_day, start, end):
-                    load[hour] = mw
+            load[_hour_range_mask(hour_of_day, start, end)] = mw
 
     elif mode == 'csv':
         data = params.get('data')
@@ -148,40 +149,55 @@ def build_load_profile(
     return load
 
 
-def _is_in_range(hour: int, start: int, end: int) -> bool:
+@lru_cache(maxsize=4)
+def _hour_indices(num_hours: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hour-of-day (0-23) and day-of-year (1-based) lookup arrays for a profile.
+
+    Cached per length and returned read-only, since every builder call shares them.
+    """
+    hours = np.arange(num_hours)
+    hour_of_day = hours % 24
+    day_of_year = hours // 24 + 1
+    hour_of_day.flags.writeable = False
+    day_of_year.flags.writeable = False
+    return hour_of_day, day_of_year
+
+
+def _hour_range_mask(hour_of_day: np.ndarray, start: int, end: int) -> np.ndarray:
     """
-    Check if hour is within range, handling midnight wraparound.
+    Mask the hours that fall within [start, end), handling midnight wraparound.
 
     Args:
-        hour: Hour to check (0-23)
+        hour_of_day: Hours to check (0-23)
         start: Start hour
         end: End hour
 
     Returns:
-        True if hour is in range
+        Boolean array, True where the hour is in range
     """
     if start < end:
         # Normal range (e.g., 6-18)
-        return start <= hour < end
+        return (hour_of_day >= start) & (hour_of_day < end)
     elif start > end:
         # Crosses midnight (e.g., 18-6)
-        return hour >= start or hour < end
+        return (hour_of_day >= start) | (hour_of_day < end)
     else:
         # start == end means no hours
-        return False
+        return np.zeros(hour_of_day.shape, dtype=bool)
 
 
-def _is_in_month_range(day_of_year: int, start_month: int, end_month: int) -> bool:
+def _month_range_mask(day_of_year: np.ndarray, start_month: int, end_month: int) -> np.ndarray:
     """
-    Check if day_of_year falls within the month range.
+    Mask the days that fall within the month range.
 
     Args:
-        day_of_year: Day of year (1-365)
+        day_of_year: Days of year (1-365)
         start_month: Start month (1-12)
         end_month: End month (1-12)
 
     Returns:
-        True if day is in range
+        Boolean array, True where the day is in range
 
     Handles wraparound (e.g., October to March crossing year boundary).
     """
@@ -190,10 +206,19 @@ def _is_in_month_range(day_of_year: int, start_month: int, end_month: int) -> bo
 
     if start_month <= end_month:
         # Normal range (e.g., April to October)
-        return start_day <= day_of_year <= end_day
+        return (day_of_year >= start_day) & (day_of_year <= end_day)
     else:
         # Crosses year boundary (e.g., October to March)
-        return day_of_year >= start_day or day_of_year <= end_day
+        return (day_of_year >= start_day) | (day_of_year <= end_day)
+
+
+def _hour_of_day_mean(load: np.ndarray) -> np.ndarray:
+    """Mean load for each hour of day (24 values, 0 for hours with no samples)."""
+    load = np.asarray(load, dtype=float)
+    hour_of_day, _ = _hour_indices(len(load))
+    totals = np.bincount(hour_of_day, weights=load, minlength=24)
+    counts = np.bincount(hour_of_day, minlength=24)
+    return np.divide(totals, counts, out=np.zeros(24), where=counts > 0)
 
 
 def calculate_seasonal_stats(start_month: int, end_month: int,
@@ -224,21 +249,12 @@ def calculate_seasonal_stats(start_month: int, end_month: int,
         # Crosses midnight (e.g., 22:00 to 06:00)
         hours_per_day = (24 - day_start) + effective_end
 
-    # Calculate total active days using actual month day counts
-    total_days = 0
+    # Count active days from the month-of-day table (handles year wraparound)
     if start_month <= end_month:
-        # Normal range (e.g., March to October)
-        for month in range(start_month, end_month + 1):
-            days_in_month = MONTH_DAY_END[month] - MONTH_DAY_START[month] + 1
-            total_days += days_in_month
+        active_days = (MONTH_OF_DAY >= start_month) & (MONTH_OF_DAY <= end_month)
     else:
-        # Crosses year boundary (e.g., October to March)
-        for month in range(start_month, 13):  # start_month to December
-            days_in_month = MONTH_DAY_END[month] - MONTH_DAY_START[month] + 1
-            total_days += days_in_month
-        for month in range(1, end_month + 1):  # January to end_month
-            days_in_month = MONTH_DAY_END[month] - MONTH_DAY_START[month] + 1
-            total_days += days_in_month
+        active_days = (MONTH_OF_DAY >= start_month) | (MONTH_OF_DAY <= end_month)
+    total_days = int(np.count_nonzero(active_days))
 
     total_active_hours = total_days * hours_per_day
 
@@ -278,26 +294,22 @@ def analyze_load_profile(load: np.ndarray) -> Dict[str, Any]:
             'daily_pattern': np.zeros(24),
         }
 
-    # Basic statistics
-    total_energy = np.sum(load)
-    peak = np.max(load)
-    min_load = np.min(load)
-    avg = np.mean(load)
+    # Basic statistics (the mean reuses the total instead of a second sweep)
+    load = np.asarray(load, dtype=float)
+    total_energy = load.sum()
+    peak = load.max()
+    min_load = load.min()
+    avg = total_energy / len(load)
 
     # Count hours
-    load_hours = np.sum(load > 0)
+    load_hours = np.count_nonzero(load > 0)
     no_load_hours = len(load) - load_hours
 
     # Load factor
     load_factor = (avg / peak * 100) if peak > 0 else 0
 
     # Daily pattern (average by hour of day)
-    hours = np.arange(len(load)) % 24
-    daily_pattern = np.zeros(24)
-    for h in range(24):
-        mask = hours == h
-        if np.any(mask):
-            daily_pattern[h] = np.mean(load[mask])
+    daily_pattern = _hour_of_day_mean(load)
 
     return {
         'total_energy_mwh': float(total_energy),
@@ -326,16 +338,26 @@ def get_load_sparkline_data(load: np.ndarray, num_points: int = 24) -> List[floa
         return [0] * num_points
 
     # Average by hour of day for a typical day pattern
-    hours = np.arange(len(load)) % 24
-    daily_avg = []
-    for h in range(24):
-        mask = hours == h
-        if np.any(mask):
-            daily_avg.append(np.mean(load[mask]))
-        else:
-            daily_avg.append(0)
+    return _hour_of_day_mean(load).tolist()
 
-    return daily_avg
+
+def read_profile_csv(csv_file) -> pd.DataFrame:
+    """
+    Read an uploaded load or solar profile CSV.
+
+    Uses pandas' default C parser rather than the PyArrow engine, which
+    differs on ordinary uploads: the C parser renames duplicate headers
+    ('a', 'a.1') so each column is 1-D, names blank headers 'Unnamed: N',
+    pads short rows with NaN and leaves timestamp columns as text. The
+    validators below rely on all of these.
+
+    Args:
+        csv_file: Path or file-like object with the CSV contents
+
+    Returns:
+        DataFrame for validate_load_csv / validate_solar_csv
+    """
+    return pd.read_csv(csv_file)
 
 
 def validate_load_csv(df: pd.DataFrame) -> Tuple[bool, str, Optional[np.ndarray]]:
@@ -459,13 +481,19 @@ def analyze_solar_profile(solar: np.ndarray) -> Dict[str, Any]:
     Returns:
         Dictionary with statistics
     """
+    # One sweep each for the total and the peak; the mean and capacity factor derive from them
+    solar = np.asarray(solar, dtype=float)
+    total = float(solar.sum())
+    peak = float(solar.max())
+    mean = total / len(solar)
+
     return {
-        'total_generation_mwh': float(np.sum(solar)),
-        'peak_mw': float(np.max(solar)),
-        'mean_mw': float(np.mean(solar)),
-        'generation_hours': int(np.sum(solar > 0)),
-        'zero_hours': int(np.sum(solar == 0)),
-        'capacity_factor': float(np.mean(solar) / np.max(solar)) if np.max(solar) > 0 else 0,
+        'total_generation_mwh': total,
+        'peak_mw': peak,
+        'mean_mw': mean,
+        'generation_hours': int(np.count_nonzero(solar > 0)),
+        'zero_hours': int(np.count_nonzero(solar == 0)),
+        'capacity_factor': mean / peak if peak > 0 else 0,
     }
 
 
@@ -550,29 +578,21 @@ def create_load_preview_chart_data(load: np.ndarray) -> Dict[str, Any]:
         Dict with chart data
     """
     # Get typical day pattern
-    hours = np.arange(len(load)) % 24
-
-    # Calculate hourly averages
-    hourly_avg = []
-    hourly_min = []
-    hourly_max = []
-
-    for h in range(24):
-        mask = hours == h
-        if np.any(mask):
-            hourly_avg.append(np.mean(load[mask]))
-            hourly_min.append(np.min(load[mask]))
-            hourly_max.append(np.max(load[mask]))
-        else:
-            hourly_avg.append(0)
-            hourly_min.append(0)
-            hourly_max.append(0)
+    load = np.asarray(load, dtype=float)
+    hour_of_day, _ = _hour_indices(len(load))
+
+    # Hourly min/max via unbuffered ufunc reductions; hours never seen stay 0
+    hourly_min = np.full(24, np.inf)
+    hourly_max = np.full(24, -np.inf)
+    np.minimum.at(hourly_min, hour_of_day, load)
+    np.maximum.at(hourly_max, hour_of_day, load)
+    seen = np.isfinite(hourly_min)
 
     return {
         'hours': list(range(24)),
-        'avg': hourly_avg,
-        'min': hourly_min,
-        'max': hourly_max,
+        'avg': _hour_of_day_mean(load).tolist(),
+        'min': np.where(seen, hourly_min, 0.0).tolist(),
+        'max': np.where(seen, hourly_max, 0.0).tolist(),
     }
 
 
@@ -78,6 +78,24 @@ TEMPLATES = {
     },
 }
 
+# Trigger options (key, display label) that make sense for each DG timing
+VALID_TRIGGERS_BY_TIMING = {
+    'anytime': (
+        ('reactive', 'When battery + solar cannot meet load'),
+        ('soc_based', 'When battery charge drops below threshold'),
+    ),
+    'day_only': (
+        ('soc_based', 'When battery charge drops below threshold'),
+    ),
+    'night_only': (
+        ('proactive', 'At start of night (pre-emptive charging)'),
+        ('soc_based', 'When battery charge drops below threshold'),
+    ),
+    'custom_blackout': (
+        ('reactive', 'When battery + solar cannot meet load'),
+    ),
+}
+
 
 def infer_template(
     dg_enabled: bool,
@@ -184,25 +202,7 @@ def get_valid_triggers_for_timing(dg_timing: str) -> list:
     Returns:
         List of valid trigger options with display labels
     """
-    if dg_timing == 'anytime':
-        return [
-            ('reactive', 'When battery + solar cannot meet load'),
-            ('soc_based', 'When battery charge drops below threshold'),
-        ]
-    elif dg_timing == 'day_only':
-        return [
-            ('soc_based', 'When battery charge drops below threshold'),
-        ]
-    elif dg_timing == 'night_only':
-        return [
-            ('proactive', 'At start of night (pre-emptive charging)'),
-            ('soc_based', 'When battery charge drops below threshold'),
-        ]
-    elif dg_timing == 'custom_blackout':
-        return [
-            ('reactive', 'When battery + solar cannot meet load'),
-        ]
-    return []
+    return list(VALID_TRIGGERS_BY_TIMING.get(dg_timing, ()))
 
 
 def validate_template_params(
@@ -434,12 +434,8 @@ def estimate_simulation_time() -> str:
         return f"~{int(seconds / 60)} minutes (consider reducing range)"
 
 
-def get_step_status(step: int) -> str:
-    """Get status of a step: 'completed', 'current', 'pending', or 'locked'."""
-    init_wizard_state()
-    current = st.session_state.wizard['current_step']
-    max_completed = st.session_state.wizard['max_completed_step']
-
+def _step_status(step: int, current: int, max_completed: int) -> str:
+    """Status of a step given the current step and the highest completed one."""
     if step < current and step <= max_completed:
         return 'completed'
     elif step == current:
@@ -450,6 +446,22 @@ def get_step_status(step: int) -> str:
         return 'locked'
 
 
+def get_step_status(step: int) -> str:
+    """Get status of a step: 'completed', 'current', 'pending', or 'locked'."""
+    init_wizard_state()
+    wizard = st.session_state.wizard
+    return _step_status(step, wizard['current_step'], wizard['max_completed_step'])
+
+
+def get_all_step_statuses(num_steps: int = 5) -> Dict[int, str]:
+    """Get the status of steps 1..num_steps, reading the wizard state once."""
+    init_wizard_state()
+    wizard = st.session_state.wizard
+    current = wizard['current_step']
+    max_completed = wizard['max_completed_step']
+    return {step: _step_status(step, current, max_completed) for step in range(1, num_steps + 1)}
+
+
 def build_simulation_params() -> Dict[str, Any]:
     """Build SimulationParams dict from wizard state."""
     init_wizard_state()
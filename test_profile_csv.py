@@ -0,0 +1,80 @@
+"""
+Test script for reading uploaded load/solar profile CSVs in Step 1.
+Checks that awkward uploads (duplicate headers, short rows) reach the
+validators as 1-D columns with NaN padding, not as errors or 2-D data.
+"""
+
+import io
+
+import numpy as np
+
+from src.load_builder import read_profile_csv, validate_load_csv, validate_solar_csv
+
+
+def make_csv(header, rows):
+    """Build an in-memory CSV upload from a header line and row strings."""
+    return io.BytesIO(("\n".join([header] + rows) + "\n").encode())
+
+
+def test_duplicate_headers():
+    """Duplicate headers are renamed, so the chosen column stays 1-D"""
+    print("\n=== Testing Duplicate Headers ===")
+
+    rows = [f"{h},{h * 2}" for h in range(48)]
+    df = read_profile_csv(make_csv("load,load", rows))
+
+    assert list(df.columns) == ['load', 'load.1'], f"Unexpected columns: {list(df.columns)}"
+
+    is_valid, message, data = validate_load_csv(df)
+    assert is_valid, message
+    assert data.ndim == 1, f"Expected 1-D data, got shape {data.shape}"
+    assert np.array_equal(data, np.arange(48)), "Load column should be the first 'load'"
+    print(f"[PASS] {message}")
+
+    df = read_profile_csv(make_csv("solar,solar", rows))
+    is_valid, message, data = validate_solar_csv(df)
+    assert is_valid, message
+    assert data.shape == (8760,), f"Expected 8760 hours, got shape {data.shape}"
+    print(f"[PASS] {message}")
+
+
+def test_short_rows():
+    """Short rows are padded with NaN and rejected by the validator"""
+    print("\n=== Testing Short Rows ===")
+
+    rows = [f"{h},{h}" for h in range(48)]
+    rows[10] = "10"  # missing trailing field
+    df = read_profile_csv(make_csv("hour,load", rows))
+
+    assert df.shape == (48, 2), f"Expected 48x2 frame, got {df.shape}"
+    assert np.isnan(df.loc[10, 'load']), "Short row should be padded with NaN"
+
+    is_valid, message, data = validate_load_csv(df)
+    assert not is_valid, "Profile with a short row should not validate"
+    assert data is None
+    print(f"[PASS] {message}")
+
+
+def test_blank_header():
+    """A blank header becomes 'Unnamed: N' rather than an empty name"""
+    print("\n=== Testing Blank Header ===")
+
+    rows = [f"{h},{h % 24}" for h in range(48)]
+    df = read_profile_csv(make_csv("hour,", rows))
+
+    assert list(df.columns) == ['hour', 'Unnamed: 1'], f"Unexpected columns: {list(df.columns)}"
+    print(f"[PASS] columns={list(df.columns)}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Profile CSV Reader Test Suite")
+    print("=" * 60)
+
+    test_duplicate_headers()
+    test_short_rows()
+    test_blank_header()
+
+    print("\n" + "=" * 60)
+    print("[PASS] ALL TESTS PASSED")
+    print("=" * 60)
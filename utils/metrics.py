@@ -127,6 +127,30 @@ def find_optimal_battery_size(all_results):
     }
 
 
+def hour_date_strings(hours):
+    """
+    Format the calendar date of each simulation hour as 'YYYY-MM-DD'.
+
+    Each distinct day is formatted once with a single DatetimeIndex.strftime
+    call, then looked up by day number, instead of formatting every hour.
+
+    Args:
+        hours: Hour indices from the start of the simulation year
+
+    Returns:
+        np.ndarray: Date strings, one per hour
+    """
+    day_idx = np.asarray(hours) // 24
+    if len(day_idx) == 0:
+        return np.array([], dtype=object)
+
+    start_date = datetime.date(SIMULATION_START_YEAR, 1, 1)
+    first_day = int(day_idx.min())
+    days = pd.date_range(pd.Timestamp(start_date) + pd.Timedelta(days=first_day),
+                         periods=int(day_idx.max()) - first_day + 1, freq='D')
+    return days.strftime('%Y-%m-%d').to_numpy()[day_idx - first_day]
+
+
 def create_hourly_dataframe(hourly_data):
     """
     Create a DataFrame from hourly simulation data.
@@ -140,9 +164,7 @@ def create_hourly_dataframe(hourly_data):
     df = pd.DataFrame(hourly_data)
 
     # Create date column using configured simulation start year
-    start_date = datetime.date(SIMULATION_START_YEAR, 1, 1)
-    df['date'] = pd.to_datetime(start_date) + pd.to_timedelta(df['hour'] // 24, unit='days')
-    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df['date'] = hour_date_strings(df['hour'])
 
     # Add hour of day
     df['hour_of_day'] = df['hour'] % 24
@@ -212,9 +234,7 @@ def create_dg_hourly_dataframe(hourly_data):
     df = pd.DataFrame(hourly_data)
 
     # Create date column using configured simulation start year
-    start_date = datetime.date(SIMULATION_START_YEAR, 1, 1)
-    df['date'] = pd.to_datetime(start_date) + pd.to_timedelta(df['hour'] // 24, unit='days')
-    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df['date'] = hour_date_strings(df['hour'])
 
     # Add hour of day
     df['hour_of_day'] = df['hour'] % 24